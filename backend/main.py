@@ -1,17 +1,20 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, WebSocket, WebSocketDisconnect, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, WebSocket, WebSocketDisconnect, Form, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 import pandas as pd
+import numpy as np
 import asyncio
-import json
+import orjson
+import math
 import uuid
 import time
 import os
 import sys
+import hashlib
 from typing import Dict, Optional, Literal
 from pydantic import BaseModel
-import tempfile
-from io import StringIO
+from cachetools import TTLCache
+from io import BytesIO
 
 # Add the project root to Python path to import our modules
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -19,7 +22,11 @@ from src.analyze.category_gen import generate_categories
 from src.analyze.ebay_scrape import search_ebay_items
 from src.analyze.rewrite_listing import rewrite_listing
 
-app = FastAPI(title="Ecommerce Intelligence API", version="1.0.0")
+app = FastAPI(
+    title="Ecommerce Intelligence API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Configure CORS
 app.add_middleware(
@@ -45,8 +52,160 @@ async def optimize_listing(request: ListingRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# In-memory storage for analysis jobs (in production, use Redis or a database)
-analysis_jobs: Dict[str, dict] = {}
+# In-memory storage for analysis jobs; status fields are mirrored to Redis when REDIS_URL is set.
+# Queued and processing jobs live in running_jobs, which never evicts, so a long analysis can't
+# lose its job mid-run. Once a job completes or fails it moves to analysis_jobs, bounded by count
+# and age so finished jobs (and their DataFrames) don't accumulate forever.
+MAX_JOBS = int(os.getenv("MAX_JOBS", "256"))
+JOB_TTL = int(os.getenv("JOB_TTL", "3600"))
+running_jobs: Dict[str, dict] = {}
+analysis_jobs: TTLCache = TTLCache(maxsize=MAX_JOBS, ttl=JOB_TTL)
+
+FINISHED_STATUSES = {"completed", "failed"}
+
+def _get_job(analysis_id: str) -> Optional[dict]:
+    """A job held by this worker, in flight or finished, or None if unknown or expired"""
+    return running_jobs.get(analysis_id) or analysis_jobs.get(analysis_id)
+
+# Optional Redis backend so job status and WebSocket updates are shared across uvicorn workers
+REDIS_URL = os.getenv("REDIS_URL")
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+redis_client = aioredis.from_url(REDIS_URL) if REDIS_URL and aioredis else None
+
+# Job fields mirrored to the Redis status hash (analysis:{id})
+STATUS_FIELDS = (
+    "status", "progress", "message", "startTime", "endTime",
+    "processingRate", "totalProducts", "processedProducts", "error"
+)
+
+def _updates_channel(analysis_id: str) -> str:
+    return f"analysis:{analysis_id}:updates"
+
+async def _update_job(analysis_id: str, patch: dict):
+    """Apply a patch to a job and mirror its status fields to Redis when configured"""
+    job = _get_job(analysis_id)
+    if job is None:
+        # Finished long enough ago to have expired; nothing left to patch
+        return
+    job.update(patch)
+    if job.get("status") in FINISHED_STATUSES:
+        # Hand the job to the bounded cache; (re)assigning restarts its expiry clock
+        running_jobs.pop(analysis_id, None)
+        analysis_jobs[analysis_id] = job
+    if redis_client:
+        fields = {k: orjson.dumps(v) for k, v in patch.items() if k in STATUS_FIELDS}
+        if fields:
+            key = f"analysis:{analysis_id}"
+            await redis_client.hset(key, mapping=fields)
+            await redis_client.expire(key, JOB_TTL)
+
+async def _load_remote_status(analysis_id: str) -> Optional[dict]:
+    """Fetch the status of a job owned by another worker from Redis"""
+    if not redis_client:
+        return None
+    raw = await redis_client.hgetall(f"analysis:{analysis_id}")
+    if not raw:
+        return None
+    return {k.decode(): orjson.loads(v) for k, v in raw.items()}
+
+# Completed results are mirrored to Redis too (analysis:{id}:data, :zstd, :products), so any
+# worker can serve /data and /products for a job another worker ran
+def _result_key(analysis_id: str, part: str) -> str:
+    return f"analysis:{analysis_id}:{part}"
+
+def _products_parquet(df: pd.DataFrame) -> Optional[bytes]:
+    """The categorized products as Parquet bytes, or None without pyarrow"""
+    buffer = BytesIO()
+    try:
+        df.to_parquet(buffer, engine="pyarrow", index=False)
+    except ImportError:
+        return None
+    return buffer.getvalue()
+
+async def _store_remote_result(analysis_id: str, df: pd.DataFrame, data_json: bytes, data_zstd: Optional[bytes]):
+    """Publish a finished job's payload and products for the other workers"""
+    if not redis_client:
+        return
+    products = await asyncio.to_thread(_products_parquet, df)
+    parts = {"data": data_json, "zstd": data_zstd, "products": products}
+    for part, value in parts.items():
+        if value is not None:
+            await redis_client.set(_result_key(analysis_id, part), value, ex=JOB_TTL)
+
+async def _load_remote_result(analysis_id: str) -> Optional[dict]:
+    """Rebuild a job completed by another worker from Redis, caching it on this worker"""
+    status = await _load_remote_status(analysis_id)
+    if not status or status.get("status") != "completed":
+        return status
+    data_json, data_zstd, products = await redis_client.mget(
+        [_result_key(analysis_id, part) for part in ("data", "zstd", "products")]
+    )
+    if data_json is None or products is None:
+        return status
+    df = await asyncio.to_thread(pd.read_parquet, BytesIO(products))
+    job = {
+        **status,
+        "id": analysis_id,
+        "df": df,
+        "analytics": orjson.loads(data_json)["analytics"],
+        "data_json": data_json,
+        "data_zstd": data_zstd
+    }
+    analysis_jobs[analysis_id] = job
+    return job
+
+# Identical uploads reuse the analysis already started for them, keyed by a content digest.
+# The digest -> analysis id map lives in Redis (result:{digest}) when configured.
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+upload_results: TTLCache = TTLCache(maxsize=MAX_JOBS, ttl=JOB_TTL)
+
+def _hash_upload(upload) -> str:
+    """Digest an uploaded file in blocks straight from its spool, leaving it rewound"""
+    hasher = blake3() if blake3 else hashlib.blake2b(digest_size=32)
+    upload.seek(0)
+    for block in iter(lambda: upload.read(1 << 20), b""):
+        hasher.update(block)
+    upload.seek(0)
+    return hasher.hexdigest()
+
+async def _claim_upload(digest: str, analysis_id: str) -> Optional[str]:
+    """Register analysis_id for this upload, or return the id of a live analysis of the same file"""
+    key = f"result:{digest}"
+    existing = upload_results.get(digest)
+    if existing is None and redis_client:
+        if await redis_client.set(key, analysis_id, nx=True, ex=JOB_TTL):
+            upload_results[digest] = analysis_id
+            return None
+        existing = (await redis_client.get(key) or b"").decode() or None
+    
+    if existing:
+        job = _get_job(existing) or await _load_remote_status(existing)
+        # Failed (or expired) analyses are re-run rather than served
+        if job and job.get("status") != "failed":
+            return existing
+    
+    upload_results[digest] = analysis_id
+    if redis_client:
+        await redis_client.set(key, analysis_id, ex=JOB_TTL)
+    return None
+
+# Upper bound on in-flight OpenAI requests per analysis
+MAX_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "500"))
+
+# Job fields that stay server-side and are never pushed over the WebSocket
+PRIVATE_JOB_FIELDS = {"df", "data_json", "data_zstd"}
+
+def _job_snapshot(analysis_id: str) -> dict:
+    """Return the JSON-safe view of a job used for WebSocket updates"""
+    return {k: v for k, v in (_get_job(analysis_id) or {}).items() if k not in PRIVATE_JOB_FIELDS}
 
 class AnalysisRequest(BaseModel):
     apiTier: Optional[str] = "tier5"
@@ -56,28 +215,192 @@ class EbaySearchRequest(BaseModel):
     days_back: Optional[int] = 7
     limit: Optional[int] = 100
 
+# Column schema of the Mercari sales report, so the parsers allocate typed buffers
+# directly instead of inferring (and holding object copies) across the whole file
+MERCARI_MONEY_COLUMNS = [
+    "Item Price", "Buyer Shipping Fee", "Seller Shipping Fee", "Mercari Selling Fee",
+    "Payment Processing Fee Charged To Seller", "Shipping Adjustment Fee", "Penalty Fee",
+    "Net Seller Proceeds", "Sales Tax Charged to Buyer", "Merchant Fees Charged to Buyer",
+    "Service Fee Charged to Buyer", "Buyer Protection Charged to Buyer",
+    "Payment Processing Fee Charged to Buyer",
+]
+MERCARI_DTYPES = {
+    "Item Id": "string",
+    "Item Title": "string",
+    "Order Status": "category",
+    "Shipped to State": "category",
+    "Shipped from State": "category",
+    **{col: "float64" for col in MERCARI_MONEY_COLUMNS},
+}
+MERCARI_PARSE_DATES = ["Sold Date", "Canceled Date", "Completed Date"]
+
+def _read_csv_fast(buf):
+    """Parse a CSV buffer with the C engine straight into the Mercari schema's dtypes.
+    
+    Mercari writes titles ending in an inch mark as `24"",` with no closing quote; pyarrow's
+    strict parser rejects every such export, so it is not attempted here."""
+    start = buf.tell()
+    # Only apply the schema to columns the file actually has
+    header = pd.read_csv(buf, nrows=0).columns
+    buf.seek(start)
+    return pd.read_csv(
+        buf,
+        engine="c",
+        dtype={col: dtype for col, dtype in MERCARI_DTYPES.items() if col in header},
+        parse_dates=[col for col in MERCARI_PARSE_DATES if col in header]
+    )
+
+def _dumps(message: dict) -> bytes:
+    return orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+# Completed dashboard payloads are encoded (and zstd-compressed when available) once,
+# then served as-is to every client that asks for them
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+def _encode_dashboard(payload: dict) -> tuple:
+    """Return the dashboard payload as JSON bytes and, if zstandard is installed, a zstd frame"""
+    data_json = _dumps(payload)
+    data_zstd = zstandard.ZstdCompressor(level=3).compress(data_json) if zstandard else None
+    return data_json, data_zstd
+
+# Progress ticks go out as compact msgpack binary frames when msgpack is available;
+# status and terminal frames stay JSON text
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+def _progress_frame(progress: int, processed: int) -> bytes:
+    return msgpack.packb({"t": "p", "p": progress, "n": processed})
+
+# Idle sockets get a one-byte ping this often so dead peers are noticed between updates,
+# and any single send that takes longer than SEND_TIMEOUT counts as a dead peer
+HEARTBEAT_INTERVAL = 15.0
+SEND_TIMEOUT = 5.0
+HEARTBEAT_FRAME = b"\x00"
+
+# Longest wait between attempts to resubscribe the Redis update relay
+RELAY_MAX_BACKOFF = 30.0
+
+# Progress snapshots are idempotent, so a backlog of them collapses into the newest one
+COALESCED_MESSAGE_TYPES = {"status_update", "progress_update"}
+
 class ConnectionManager:
     def __init__(self):
         self.active_connections: Dict[str, WebSocket] = {}
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.writers: Dict[str, asyncio.Task] = {}
 
     async def connect(self, websocket: WebSocket, analysis_id: str):
         await websocket.accept()
         self.active_connections[analysis_id] = websocket
+        # A bounded queue per socket keeps slow peers from stalling the analysis pipeline
+        queue = asyncio.Queue(maxsize=32)
+        self.queues[analysis_id] = queue
+        self.writers[analysis_id] = asyncio.create_task(self._writer(analysis_id, websocket, queue))
 
     def disconnect(self, analysis_id: str):
         if analysis_id in self.active_connections:
             del self.active_connections[analysis_id]
+        self.queues.pop(analysis_id, None)
+        writer = self.writers.pop(analysis_id, None)
+        if writer and writer is not asyncio.current_task():
+            writer.cancel()
 
     async def send_update(self, analysis_id: str, message: dict):
-        if analysis_id in self.active_connections:
+        if redis_client:
+            # Publish so whichever worker holds the socket forwards it
+            await redis_client.publish(_updates_channel(analysis_id), _dumps(message))
+        else:
+            self._deliver(analysis_id, message)
+
+    def _deliver(self, analysis_id: str, message: dict):
+        queue = self.queues.get(analysis_id)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Drop the oldest frame to make room for the latest state
+            queue.get_nowait()
+            queue.put_nowait(message)
+
+    async def _writer(self, analysis_id: str, websocket: WebSocket, queue: asyncio.Queue):
+        """Drain a connection's queue, sending only the newest of any pending progress frames"""
+        while True:
+            try:
+                batch = [await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_INTERVAL)]
+            except asyncio.TimeoutError:
+                # Pings go through this task too, so the socket only ever has one sender
+                batch = []
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            outgoing = []
+            latest_progress = None
+            for message in batch:
+                if message.get("type") in COALESCED_MESSAGE_TYPES:
+                    latest_progress = message
+                else:
+                    # Terminal frames supersede any progress queued before them
+                    latest_progress = None
+                    outgoing.append(message)
+            if latest_progress is not None:
+                outgoing.append(latest_progress)
+            
             try:
-                await self.active_connections[analysis_id].send_text(json.dumps(message))
-            except:
-                # Connection might be closed
+                if not batch:
+                    await asyncio.wait_for(websocket.send_bytes(HEARTBEAT_FRAME), timeout=SEND_TIMEOUT)
+                for message in outgoing:
+                    if message.get("type") == "progress_update" and msgpack:
+                        data = message["data"]
+                        send = websocket.send_bytes(_progress_frame(data["progress"], data["processedProducts"]))
+                    else:
+                        send = websocket.send_text(_dumps(message).decode())
+                    await asyncio.wait_for(send, timeout=SEND_TIMEOUT)
+            except (WebSocketDisconnect, asyncio.TimeoutError, RuntimeError, OSError) as e:
+                # Closed, timed out or unwritable socket: stop writing and drop the connection
+                print(f"🔌 Dropping WebSocket for {analysis_id}: {type(e).__name__}")
                 self.disconnect(analysis_id)
+                return
+
+    async def relay_redis_updates(self):
+        """Forward updates published by any worker to the sockets connected to this one,
+        resubscribing with backoff whenever the Redis connection drops"""
+        delay = 1.0
+        while True:
+            pubsub = redis_client.pubsub()
+            try:
+                await pubsub.psubscribe(_updates_channel("*"))
+                delay = 1.0
+                async for msg in pubsub.listen():
+                    if msg["type"] != "pmessage":
+                        continue
+                    analysis_id = msg["channel"].decode().split(":")[1]
+                    if analysis_id in self.queues:
+                        self._deliver(analysis_id, orjson.loads(msg["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"⚠️ Redis relay lost ({type(e).__name__}: {e}); resubscribing in {delay:.0f}s")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RELAY_MAX_BACKOFF)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
 
 manager = ConnectionManager()
 
+@app.on_event("startup")
+async def start_redis_relay():
+    if redis_client:
+        asyncio.create_task(manager.relay_redis_updates())
+
 @app.get("/")
 async def root():
     return {"message": "Ecommerce Intelligence API is running"}
@@ -96,228 +419,240 @@ async def upload_and_analyze(
     analysis_id = f"analysis_{uuid.uuid4().hex[:8]}"
     
     try:
-        # Read the uploaded file content with proper encoding handling
-        content = await file.read()
-        # Handle BOM and encoding issues
-        try:
-            csv_content = content.decode('utf-8-sig')  # utf-8-sig removes BOM automatically
-        except UnicodeDecodeError:
-            # Fallback to regular utf-8
-            csv_content = content.decode('utf-8')
+        # Starlette already spools the multipart body to a SpooledTemporaryFile, so parse it
+        # in place rather than pulling the whole upload into a single bytes object
+        upload = file.file
+        
+        # Same file as an analysis that is still around: hand back its id instead of re-categorizing
+        digest = await asyncio.to_thread(_hash_upload, upload)
+        existing_id = await _claim_upload(digest, analysis_id)
+        if existing_id:
+            return {"analysisId": existing_id}
         
-        # Parse CSV to get product count for progress tracking
-        df = pd.read_csv(StringIO(csv_content))
+        # Skip the UTF-8 BOM Mercari exports start with
+        if upload.read(3) != b'\xef\xbb\xbf':
+            upload.seek(0)
         
-        # Remove last 2 rows (summary rows) like in your parseCSVFile function
-        df = df.iloc[:-2]
+        # Parse CSV off the event loop to get product count for progress tracking
+        df = await asyncio.to_thread(_read_csv_fast, upload)
+        
+        # Remove last 2 rows (summary rows) like in your parseCSVFile function. This is the
+        # only slice; the fresh index means later column writes never land on a view of the parse
+        df = df.iloc[:-2].reset_index(drop=True)
         
         total_products = len(df)
         
         # Store job info
-        analysis_jobs[analysis_id] = {
+        running_jobs[analysis_id] = {
             "id": analysis_id,
+            "df": df,
+            "api_tier": api_tier,
+            "analytics": None
+        }
+        await _update_job(analysis_id, {
             "status": "queued",
             "progress": 0,
             "message": "Analysis queued...",
             "startTime": time.time(),
             "totalProducts": total_products,
             "processedProducts": 0,
-            "csv_content": csv_content,
-            "api_tier": api_tier,
-            "data": None,
             "error": None
-        }
+        })
         
         # Start the analysis task in the background
-        asyncio.create_task(process_analysis(analysis_id, csv_content, api_tier))
+        asyncio.create_task(process_analysis(analysis_id, api_tier))
         
         return {"analysisId": analysis_id}
         
     except Exception as e:
+        running_jobs.pop(analysis_id, None)
         raise HTTPException(status_code=500, detail=f"Failed to process file: {str(e)}")
 
-async def process_analysis(analysis_id: str, csv_content: str, api_tier: str):
+def _safe_col(df: pd.DataFrame, col: str) -> np.ndarray:
+    """A column as float64 with non-numeric, NaN and infinite values zeroed, in one vectorized pass"""
+    values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)
+
+REGION_MAPPING = {
+    'California': 'West', 'Texas': 'South', 'Florida': 'South', 'New York': 'Northeast',
+    'Pennsylvania': 'Northeast', 'Illinois': 'Midwest', 'Ohio': 'Midwest', 'Georgia': 'South',
+    'North Carolina': 'South', 'Michigan': 'Midwest'
+}
+
+def _compute_analytics(categorized_df: pd.DataFrame, processing_time: float, processing_rate: float) -> dict:
+    """Build the dashboard analytics from the categorized frame (CPU-bound), leaving the frame as is"""
+    
+    def group_key(col):
+        """Grouping key for a label column, with missing values bucketed as 'Unknown'"""
+        return categorized_df[col].astype(object).fillna('Unknown')
+    
+    # Money columns with non-numeric and non-finite values zeroed, so every aggregation is a vectorized pass
+    revenue = pd.Series(_safe_col(categorized_df, 'Item Price'), index=categorized_df.index)
+    total_revenue = float(revenue.sum())
+    total_profit = float(_safe_col(categorized_df, 'Net Seller Proceeds').sum())
+    avg_margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0.0
+    
+    def revenue_by(key) -> dict:
+        return {k: float(v) for k, v in revenue.groupby(key).sum().items()}
+    
+    categories = group_key('openai_category')
+    seasons = group_key('season')
+    states = group_key('Shipped to State')
+    category_dist = revenue_by(categories)
+    
+    # Month x category revenue in one groupby; rows without a sale date drop out as NaT keys
+    months = categorized_df['Sold Date'].dt.to_period('M')
+    monthly = revenue.groupby([months, categories]).sum()
+    monthly_trends = [
+        {
+            "month": month.strftime('%b %Y'),
+            "revenue": float(by_category.sum()),
+            "byCategory": {k: float(v) for k, v in by_category.droplevel(0).items()}
+        }
+        for month, by_category in monthly.groupby(level=0)
+    ]
+    
+    # Season x category revenue and item counts, highest revenue first within each season
+    season_category = revenue.groupby([seasons, categories]).agg(['sum', 'count'])
+    seasonal_categories = {
+        season: [
+            {"category": category, "revenue": float(total), "count": int(count)}
+            for category, total, count in rows.droplevel(0).sort_values('sum', ascending=False, kind='stable').itertuples()
+        ]
+        for season, rows in season_category.groupby(level=0)
+    }
+    
+    analytics = {
+        "totalRevenue": total_revenue,
+        "totalProfit": total_profit,
+        "totalItems": len(categorized_df),
+        "avgMargin": avg_margin,
+        "categoryDistribution": category_dist,
+        "temporalPatterns": {
+            "dayOfWeek": revenue_by(group_key('day_of_week')),
+            "seasonal": revenue_by(seasons),
+            "monthlyTrends": monthly_trends,
+            "seasonalCategories": seasonal_categories
+        },
+        "geographicData": {
+            "stateRevenue": revenue_by(states),
+            "stateOrders": {k: int(v) for k, v in states.value_counts().items()},
+            "regionRevenue": revenue_by(states.map(REGION_MAPPING).fillna('Other'))
+        },
+        "recommendations": [
+            f"Processed {len(categorized_df)} products with OpenAI tier-5 in {processing_time:.1f} seconds",
+            f"Processing rate: {processing_rate:.0f} products/minute",
+            f"Top category: {max(category_dist.items(), key=lambda x: x[1])[0] if category_dist else 'Unknown'}",
+            "AI categorization completed with structured outputs"
+        ]
+    }
+    # The rollups come from scrubbed columns, so only the top-level totals need a finite check
+    analytics = {k: (0.0 if isinstance(v, float) and not math.isfinite(v) else v) for k, v in analytics.items()}
+    
+    return analytics
+
+async def process_analysis(analysis_id: str, api_tier: str):
     """Background task to process the CSV with OpenAI categorization"""
     
     try:
         # Update status to processing
-        analysis_jobs[analysis_id].update({
+        await _update_job(analysis_id, {
             "status": "processing",
             "message": f"Processing with OpenAI {api_tier} settings...",
             "progress": 5
         })
         await manager.send_update(analysis_id, {
             "type": "status_update",
-            "data": analysis_jobs[analysis_id]
+            "data": _job_snapshot(analysis_id)
         })
         
-        # Create temporary file for category_gen.py to process
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False, encoding='utf-8') as temp_file:
-            temp_file.write(csv_content)
-            temp_file_path = temp_file.name
+        # Reuse the DataFrame parsed at upload time
+        df = running_jobs[analysis_id]["df"]
         
-        try:
-            # Parse the CSV data
-            df = pd.read_csv(StringIO(csv_content))
-            df = df.iloc[:-2]  # Remove summary rows
-            
-            print(f"🚀 Starting OpenAI categorization for {len(df)} products using {api_tier}")
-            
-            # Update progress
-            analysis_jobs[analysis_id].update({
-                "progress": 10,
-                "message": f"🚀 Initializing OpenAI tier-5 processing for {len(df)} products..."
-            })
-            await manager.send_update(analysis_id, {
-                "type": "status_update", 
-                "data": analysis_jobs[analysis_id]
-            })
-            
-            # Create progress callback for real-time updates
-            async def update_progress(processed, total, progress_percent, custom_message=None):
-                message = custom_message or f"🚀 Processing... {processed}/{total} products ({progress_percent}%)"
-                analysis_jobs[analysis_id].update({
-                    "progress": progress_percent,
-                    "processedProducts": processed,
-                    "message": message
-                })
-                await manager.send_update(analysis_id, {
-                    "type": "progress_update",
-                    "data": analysis_jobs[analysis_id]
-                })
-            
-            # Use your real category_gen function with tier settings and progress tracking
-            start_time = time.time()
-            categorized_df = await generate_categories(df, api_tier, progress_callback=update_progress)
-            end_time = time.time()
-            
-            processing_time = end_time - start_time
-            processing_rate = len(df) / processing_time * 60  # products per minute
-            
-            print(f"✅ Categorization completed in {processing_time:.2f} seconds")
-            print(f"⚡ Processing rate: {processing_rate:.0f} products/minute")
-            
-            # Convert DataFrame to the format expected by frontend
-            products = categorized_df.to_dict('records')
-            
-            # Calculate analytics with NaN/infinity handling
-            def safe_float(value):
-                """Convert to float and handle NaN/infinity values"""
-                try:
-                    result = float(value or 0)
-                    if not (result == result):  # Check for NaN
-                        return 0.0
-                    if result == float('inf') or result == float('-inf'):
-                        return 0.0
-                    return result
-                except (ValueError, TypeError):
-                    return 0.0
-            
-            total_revenue = sum(safe_float(p.get('Item Price', 0)) for p in products)
-            total_profit = sum(safe_float(p.get('Net Seller Proceeds', 0)) for p in products)
-            avg_margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0.0
-            avg_margin = safe_float(avg_margin)  # Ensure avg_margin is also safe
-            
-            # Category distribution
-            category_dist = {}
-            for product in products:
-                category = product.get('openai_category', 'Unknown')
-                revenue = safe_float(product.get('Item Price', 0))
-                category_dist[category] = category_dist.get(category, 0.0) + revenue
-            
-            # Temporal patterns
-            day_of_week = {}
-            seasonal = {}
-            for product in products:
-                day = product.get('day_of_week', 'Unknown')
-                season = product.get('season', 'Unknown')
-                revenue = safe_float(product.get('Item Price', 0))
-                day_of_week[day] = day_of_week.get(day, 0.0) + revenue
-                seasonal[season] = seasonal.get(season, 0.0) + revenue
-            
-            # Geographic data
-            state_revenue = {}
-            state_orders = {}
-            region_mapping = {
-                'California': 'West', 'Texas': 'South', 'Florida': 'South', 'New York': 'Northeast',
-                'Pennsylvania': 'Northeast', 'Illinois': 'Midwest', 'Ohio': 'Midwest', 'Georgia': 'South',
-                'North Carolina': 'South', 'Michigan': 'Midwest'
-            }
-            region_revenue = {}
-            
-            for product in products:
-                state = product.get('Shipped to State', 'Unknown')
-                revenue = safe_float(product.get('Item Price', 0))
-                state_revenue[state] = state_revenue.get(state, 0.0) + revenue
-                state_orders[state] = state_orders.get(state, 0) + 1
-                region = region_mapping.get(state, 'Other')
-                region_revenue[region] = region_revenue.get(region, 0.0) + revenue
-            
-            # Sanitize all numeric values in the analytics
-            def sanitize_dict(d):
-                """Recursively sanitize a dictionary to ensure all float values are JSON-safe"""
-                if isinstance(d, dict):
-                    return {k: sanitize_dict(v) for k, v in d.items()}
-                elif isinstance(d, list):
-                    return [sanitize_dict(item) for item in d]
-                elif isinstance(d, float):
-                    return safe_float(d)
-                else:
-                    return d
-            
-            # Store the completed analysis
-            dashboard_data = {
-                "products": [sanitize_dict(p) for p in products],
-                "analytics": sanitize_dict({
-                    "totalRevenue": total_revenue,
-                    "totalProfit": total_profit,
-                    "totalItems": len(products),
-                    "avgMargin": avg_margin,
-                    "categoryDistribution": category_dist,
-                    "temporalPatterns": {
-                        "dayOfWeek": day_of_week,
-                        "seasonal": seasonal,
-                        "monthlyTrends": []  # Can be calculated if needed
-                    },
-                    "geographicData": {
-                        "stateRevenue": state_revenue,
-                        "stateOrders": state_orders,
-                        "regionRevenue": region_revenue
-                    },
-                    "recommendations": [
-                        f"Processed {len(products)} products with OpenAI tier-5 in {processing_time:.1f} seconds",
-                        f"Processing rate: {safe_float(processing_rate):.0f} products/minute",
-                        f"Top category: {max(category_dist.items(), key=lambda x: x[1])[0] if category_dist else 'Unknown'}",
-                        "AI categorization completed with structured outputs"
-                    ]
-                })
-            }
+        print(f"🚀 Starting OpenAI categorization for {len(df)} products using {api_tier}")
+        
+        # Update progress
+        await _update_job(analysis_id, {
+            "progress": 10,
+            "message": f"🚀 Initializing OpenAI tier-5 processing for {len(df)} products..."
+        })
+        await manager.send_update(analysis_id, {
+            "type": "status_update", 
+            "data": _job_snapshot(analysis_id)
+        })
+        
+        # Create progress callback for real-time updates, coalesced to ~10 Hz or each new percent
+        last_sent_ts = 0.0
+        last_sent_pct = -1
+        
+        async def update_progress(processed, total, progress_percent, custom_message=None):
+            nonlocal last_sent_ts, last_sent_pct
+            now = time.monotonic()
+            if now - last_sent_ts < 0.1 and progress_percent - last_sent_pct < 1 and progress_percent < 100:
+                return
+            last_sent_ts = now
+            last_sent_pct = progress_percent
             
-            analysis_jobs[analysis_id].update({
-                "status": "completed",
-                "progress": 100,
-                "message": f"✅ Analysis completed! Processed {len(products)} products in {processing_time:.1f}s",
-                "endTime": time.time(),
-                "processingRate": processing_rate,
-                "processedProducts": len(products),
-                "data": dashboard_data
+            message = custom_message or f"🚀 Processing... {processed}/{total} products ({progress_percent}%)"
+            await _update_job(analysis_id, {
+                "progress": progress_percent,
+                "processedProducts": processed,
+                "message": message
             })
-            
+            # Only the changing fields; clients already hold the rest from the status frames
             await manager.send_update(analysis_id, {
-                "type": "analysis_complete",
-                "data": analysis_jobs[analysis_id]
+                "type": "progress_update",
+                "data": {"progress": progress_percent, "processedProducts": processed}
             })
-            
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(temp_file_path)
-            except:
-                pass
-                
+        
+        # Use your real category_gen function with tier settings and progress tracking
+        start_time = time.time()
+        categorized_df = await generate_categories(
+            df, api_tier, concurrency=MAX_CONCURRENCY, progress_callback=update_progress
+        )
+        end_time = time.time()
+        
+        processing_time = end_time - start_time
+        processing_rate = len(df) / processing_time * 60  # products per minute
+        
+        print(f"✅ Categorization completed in {processing_time:.2f} seconds")
+        print(f"⚡ Processing rate: {processing_rate:.0f} products/minute")
+        
+        # The aggregation is pure pandas work, so keep it off the event loop
+        analytics = await asyncio.to_thread(_compute_analytics, categorized_df, processing_time, processing_rate)
+        
+        # Rows are served a page at a time from /products; the dashboard charts only need the rollups
+        data_json, data_zstd = await asyncio.to_thread(_encode_dashboard, {
+            "analytics": analytics,
+            "productsUrl": f"/api/analysis/{analysis_id}/products",
+            "productCount": len(categorized_df)
+        })
+        
+        # Results go to Redis before the status flips, so no worker sees "completed" without them
+        await _store_remote_result(analysis_id, categorized_df, data_json, data_zstd)
+        
+        await _update_job(analysis_id, {
+            "status": "completed",
+            "progress": 100,
+            "message": f"✅ Analysis completed! Processed {len(categorized_df)} products in {processing_time:.1f}s",
+            "endTime": time.time(),
+            "processingRate": processing_rate,
+            "processedProducts": len(categorized_df),
+            # Keep the products columnar; records are only built per request
+            "df": categorized_df,
+            "analytics": analytics,
+            "data_json": data_json,
+            "data_zstd": data_zstd
+        })
+        
+        await manager.send_update(analysis_id, {
+            "type": "analysis_complete",
+            "data": _job_snapshot(analysis_id)
+        })
+        
     except Exception as e:
         print(f"❌ Analysis failed: {str(e)}")
-        analysis_jobs[analysis_id].update({
+        await _update_job(analysis_id, {
             "status": "failed",
             "progress": 0,
             "message": f"Analysis failed: {str(e)}",
@@ -326,17 +661,18 @@ async def process_analysis(analysis_id: str, csv_content: str, api_tier: str):
         
         await manager.send_update(analysis_id, {
             "type": "analysis_failed",
-            "data": analysis_jobs[analysis_id]
+            "data": _job_snapshot(analysis_id)
         })
 
 @app.get("/api/analysis/{analysis_id}/status")
 async def get_analysis_status(analysis_id: str):
     """Get the current status of an analysis job"""
     
-    if analysis_id not in analysis_jobs:
-        raise HTTPException(status_code=404, detail="Analysis not found")
+    # Jobs started on another worker are only visible through the Redis mirror
+    job = _get_job(analysis_id) or await _load_remote_status(analysis_id)
     
-    job = analysis_jobs[analysis_id]
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
     
     return {
         "id": analysis_id,
@@ -350,22 +686,101 @@ async def get_analysis_status(analysis_id: str):
         "processedProducts": job.get("processedProducts")
     }
 
-@app.get("/api/analysis/{analysis_id}/data")
-async def get_dashboard_data(analysis_id: str):
-    """Get the dashboard data for a completed analysis"""
+def _json_records(page: pd.DataFrame) -> list:
+    """Rows of a page as JSON-safe records, leaving the stored frame's dtypes alone: non-finite
+    numbers become 0.0, datetimes ISO strings and missing values None"""
+    page = page.copy()
+    num_cols = page.select_dtypes(include=[np.number]).columns
+    page[num_cols] = page[num_cols].replace([np.inf, -np.inf], np.nan).fillna(0.0)
+    # orjson does not encode pandas Timestamps, so emit ISO strings like the old encoder did
+    for col in page.select_dtypes(include=['datetime']).columns:
+        page[col] = page[col].dt.strftime('%Y-%m-%dT%H:%M:%S')
+    other_cols = page.columns.difference(num_cols)
+    page[other_cols] = page[other_cols].astype(object).where(page[other_cols].notna(), None)
+    return page.to_dict('records')
+
+async def _get_completed_job(analysis_id: str) -> dict:
+    """Look up a job whose analysis has finished, raising the matching HTTP error otherwise"""
     
-    if analysis_id not in analysis_jobs:
-        raise HTTPException(status_code=404, detail="Analysis not found")
+    job = _get_job(analysis_id)
+    if job is None and redis_client:
+        job = await _load_remote_result(analysis_id)
     
-    job = analysis_jobs[analysis_id]
+    if job is None:
+        raise HTTPException(status_code=404, detail="Analysis not found")
     
     if job["status"] != "completed":
         raise HTTPException(status_code=400, detail="Analysis not completed yet")
     
-    if not job.get("data"):
+    if job.get("analytics") is None:
         raise HTTPException(status_code=500, detail="Analysis data not available")
     
-    return job["data"]
+    return job
+
+@app.get("/api/analysis/{analysis_id}/data")
+async def get_dashboard_data(analysis_id: str, accept_encoding: str = Header("")):
+    """Get the dashboard data for a completed analysis"""
+    
+    job = await _get_completed_job(analysis_id)
+    headers = {"Vary": "Accept-Encoding"}
+    
+    if job.get("data_zstd") is not None and "zstd" in accept_encoding.lower():
+        headers["Content-Encoding"] = "zstd"
+        return Response(content=job["data_zstd"], media_type="application/json", headers=headers)
+    
+    return Response(content=job["data_json"], media_type="application/json", headers=headers)
+
+@app.get("/api/analysis/{analysis_id}/products")
+async def get_products(
+    analysis_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    sort: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """Get one page of categorized products, optionally sorted descending by a column and trimmed to `fields`"""
+    
+    df = (await _get_completed_job(analysis_id))["df"]
+    
+    if fields:
+        columns = [c.strip() for c in fields.split(",") if c.strip()]
+        unknown = [c for c in columns if c not in df.columns]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    else:
+        columns = None
+    
+    total = len(df)
+    if sort:
+        if sort not in df.columns:
+            raise HTTPException(status_code=400, detail=f"Unknown sort column: {sort}")
+        df = await asyncio.to_thread(df.sort_values, sort, ascending=False, kind="stable")
+    page = df.iloc[offset:offset + limit]
+    if columns:
+        page = page[columns]
+    
+    return ORJSONResponse({
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "products": _json_records(page)
+    })
+
+@app.get("/api/analysis/{analysis_id}/products.parquet")
+async def get_products_parquet(analysis_id: str):
+    """Download all categorized products as a Parquet file for bulk clients"""
+    
+    df = (await _get_completed_job(analysis_id))["df"]
+    
+    content = await asyncio.to_thread(_products_parquet, df)
+    if content is None:
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    
+    return Response(
+        content=content,
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": f'attachment; filename="{analysis_id}_products.parquet"'}
+    )
 
 @app.post("/api/ebay/search")
 async def search_ebay_prices(request: EbaySearchRequest):
@@ -392,10 +807,14 @@ async def websocket_endpoint(websocket: WebSocket, analysis_id: str):
     
     try:
         # Send current status if analysis exists
-        if analysis_id in analysis_jobs:
+        if _get_job(analysis_id) is not None:
+            job = _job_snapshot(analysis_id)
+        else:
+            job = await _load_remote_status(analysis_id)
+        if job:
             await manager.send_update(analysis_id, {
                 "type": "status_update",
-                "data": analysis_jobs[analysis_id]
+                "data": job
             })
         
         # Keep connection alive
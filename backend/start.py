@@ -4,12 +4,24 @@ Startup script for the Ecommerce Intelligence FastAPI backend
 """
 
 import uvicorn
+import importlib.util
 import sys
 import os
 
 # Add the project root to Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
+# MERCARI_DEV=1 enables auto-reload; otherwise run a multi-worker server
+DEV = os.getenv("MERCARI_DEV", "0") == "1"
+
+# Job status, results and updates only span workers through Redis, so default to one worker without it
+DEFAULT_WORKERS = (os.cpu_count() or 1) if os.getenv("REDIS_URL") else 1
+WORKERS = int(os.getenv("WORKERS", str(DEFAULT_WORKERS)))
+
+# uvloop/httptools ship with uvicorn[standard]; fall back to uvicorn's defaults (e.g. on Windows)
+LOOP = "uvloop" if importlib.util.find_spec("uvloop") else "auto"
+HTTP = "httptools" if importlib.util.find_spec("httptools") else "auto"
+
 if __name__ == "__main__":
     print("🚀 Starting Ecommerce Intelligence API Server...")
     print("📡 Backend will be available at: http://localhost:8000")
@@ -24,6 +36,9 @@ if __name__ == "__main__":
         "main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True,  # Auto-reload on code changes during development
+        reload=DEV,  # Auto-reload on code changes during development
+        workers=None if DEV else WORKERS,
+        loop=LOOP,
+        http=HTTP,
         log_level="info"
     ) 
\ No newline at end of file
@@ -2,12 +2,20 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import numpy as np
+import os
+import importlib.util
 from datetime import datetime
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+# st.plotly_chart serializes every figure through plotly.io; pin the orjson encoder when it is
+# installed rather than depending on plotly's engine auto-detection
+if importlib.util.find_spec("orjson") is not None:
+    pio.json.config.default_engine = "orjson"
+
 # Page configuration
 st.set_page_config(
     page_title="E-commerce Sales Intelligence Dashboard",
@@ -39,16 +47,298 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+DATA_PATH = "data/openai_categories.csv"
+# Columnar copy of DATA_PATH, written by the category pipeline or on the first CSV load; preferred
+# while it is up to date
+PARQUET_PATH = "data/openai_categories.parquet"
+
+# Columns the dashboard actually reads; the rest of the export is skipped at parse time
+USED_COLS = (
+    'Item Id', 'Sold Date', 'Shipped to State', 'Item Price', 'Net Seller Proceeds',
+    'Seller Shipping Fee', 'openai_category', 'openai_subcategory', 'day_of_week', 'season'
+)
+
+# Low-cardinality label columns, stored as categoricals so filters and groupbys hash small codes
+CATEGORICAL_COLS = ['openai_category', 'openai_subcategory', 'Shipped to State', 'day_of_week', 'season']
+
+# Calendar order of the temporal labels; their categoricals are ordered this way so rollups come out
+# in calendar order instead of alphabetically
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+SEASON_ORDER = ['Winter', 'Spring', 'Summer', 'Fall']
+
+# Census region for each state
+REGION_MAPPING = {
+    'California': 'West', 'Washington': 'West', 'Oregon': 'West', 'Nevada': 'West',
+    'Arizona': 'West', 'Utah': 'West', 'Colorado': 'West', 'New Mexico': 'West',
+    'Wyoming': 'West', 'Montana': 'West', 'Idaho': 'West', 'Alaska': 'West', 'Hawaii': 'West',
+    
+    'Texas': 'South', 'Florida': 'South', 'Georgia': 'South', 'North Carolina': 'South',
+    'South Carolina': 'South', 'Virginia': 'South', 'Tennessee': 'South', 'Kentucky': 'South',
+    'Alabama': 'South', 'Mississippi': 'South', 'Arkansas': 'South', 'Louisiana': 'South',
+    'Oklahoma': 'South', 'West Virginia': 'South', 'Maryland': 'South', 'Delaware': 'South',
+    'District of Columbia': 'South',
+    
+    'New York': 'Northeast', 'Pennsylvania': 'Northeast', 'Massachusetts': 'Northeast',
+    'Connecticut': 'Northeast', 'Rhode Island': 'Northeast', 'Vermont': 'Northeast',
+    'New Hampshire': 'Northeast', 'Maine': 'Northeast', 'New Jersey': 'Northeast',
+    
+    'Illinois': 'Midwest', 'Ohio': 'Midwest', 'Michigan': 'Midwest', 'Indiana': 'Midwest',
+    'Wisconsin': 'Midwest', 'Minnesota': 'Midwest', 'Iowa': 'Midwest', 'Missouri': 'Midwest',
+    'North Dakota': 'Midwest', 'South Dakota': 'Midwest', 'Nebraska': 'Midwest', 'Kansas': 'Midwest'
+}
+REGION_LEVELS = sorted(set(REGION_MAPPING.values()) | {'Other'})
+
+# 'Month Key' of sales without a sold date
+NO_MONTH = np.iinfo(np.int32).min
+
+# Named aggregations of 'Item Price' shared by the day-of-week and season rollups
+PERIOD_STATS = {'Total Revenue': 'sum', 'Sales Count': 'count', 'Avg Sale Price': 'mean'}
+
+def data_version():
+    """Modification time and size of the sales export, so the disk-persisted load and the
+    per-slice rollups are redone when it changes"""
+    stat = os.stat(DATA_PATH)
+    return stat.st_mtime, stat.st_size
+
+def _read_csv_arrow():
+    """Parse the export with pyarrow's multi-threaded reader, dictionary-encoding the label columns
+    as they are read, so they arrive as categoricals without ever existing as per-row strings"""
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+    
+    column_types = {col: pa.dictionary(pa.int32(), pa.string()) for col in CATEGORICAL_COLS}
+    column_types.update({'Item Id': pa.string(), 'Sold Date': pa.timestamp('us')})
+    table = pa_csv.read_csv(DATA_PATH, convert_options=pa_csv.ConvertOptions(
+        include_columns=list(USED_COLS),
+        column_types=column_types,
+        # Blank labels are missing, as pandas would read them
+        strings_can_be_null=True
+    ))
+    # Ids stay in the Arrow buffers instead of becoming Python str objects
+    df = table.to_pandas(types_mapper={pa.string(): pd.StringDtype('pyarrow')}.get)
+    # Dictionaries come out in first-seen order; sort them so groupbys list labels alphabetically
+    for col in CATEGORICAL_COLS:
+        df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    return df
+
+def _read_sales():
+    # The Parquet copy skips CSV parsing entirely, unless the CSV was regenerated after it
+    if os.path.exists(PARQUET_PATH) and os.path.getmtime(PARQUET_PATH) >= data_version()[0]:
+        try:
+            df = pd.read_parquet(PARQUET_PATH, columns=list(USED_COLS), memory_map=True)
+            df['Sold Date'] = pd.to_datetime(df['Sold Date'])
+            return df
+        except (ImportError, ValueError, KeyError):
+            # No Parquet engine installed, or the copy predates a column the dashboard now reads
+            pass
+    try:
+        df = _read_csv_arrow()
+    except (ImportError, ValueError):
+        # pyarrow is not installed or could not parse the file
+        df = pd.read_csv(DATA_PATH, usecols=list(USED_COLS), parse_dates=['Sold Date'])
+    try:
+        # Leave the parsed columns behind as Parquet so the next cold start skips the CSV
+        df.to_parquet(PARQUET_PATH, index=False)
+    except (ImportError, ValueError, OSError):
+        # No Parquet engine, or the data directory is read-only
+        pass
+    return df
+
 # Load data
-@st.cache_data
-def load_data():
-    df = pd.read_csv("data/openai_categories.csv")
-    df['Sold Date'] = pd.to_datetime(df['Sold Date'])
-    df['Profit'] = df['Net Seller Proceeds']
-    df['Profit Margin'] = (df['Profit'] / df['Item Price']) * 100
+@st.cache_data(persist="disk")
+def load_data(version):
+    # `version` only keys the cache: a new export gets a fresh entry instead of the persisted one
+    df = _read_sales()
+    df[CATEGORICAL_COLS] = df[CATEGORICAL_COLS].astype('category')
+    for col, order in (('day_of_week', DAY_ORDER), ('season', SEASON_ORDER)):
+        # Labels outside the calendar (e.g. 'Unknown') sort after it
+        extra = [label for label in df[col].cat.categories if label not in order]
+        df[col] = df[col].cat.set_categories(order + extra, ordered=True)
+    # Shipping fees are only ever averaged, never totalled, so they do not need float64
+    df['Seller Shipping Fee'] = df['Seller Shipping Fee'].astype(np.float32)
+    # Regions come from a per-state lookup table gathered by category code, so each distinct
+    # state is mapped once instead of once per row; missing states (code -1) land on 'Other'
+    states = df['Shipped to State'].cat
+    region_lut = np.array(
+        [REGION_LEVELS.index(REGION_MAPPING.get(state, 'Other')) for state in states.categories]
+        + [REGION_LEVELS.index('Other')]
+    )
+    df['Region'] = pd.Categorical.from_codes(region_lut[states.codes], categories=REGION_LEVELS)
+    # Keep rows in date order so the date filter can binary-search for its row range
+    df = df.sort_values('Sold Date', kind='stable').reset_index(drop=True)
+    # Calendar month as an int32 count of months since 1970, the key the monthly trend groups on;
+    # undated sales get NO_MONTH
+    months = df['Sold Date'].to_numpy().astype('datetime64[M]').view('i8')
+    df['Month Key'] = np.where(df['Sold Date'].isna(), NO_MONTH, months).astype(np.int32)
+    # Derived columns are part of the cached frame; a zero price has no margin (NaN, which
+    # the averages skip) rather than an infinite one
+    price = df['Item Price'].to_numpy(dtype=np.float64)
+    profit = df['Net Seller Proceeds'].to_numpy(dtype=np.float64)
+    margin = np.divide(profit, price, out=np.full_like(price, np.nan), where=price != 0)
+    df['Profit'] = profit
+    # Margins are only shown to one decimal, so float32 is plenty; dollar columns stay float64 so
+    # multi-thousand totals still add up to the cent
+    df['Profit Margin'] = np.multiply(margin, 100, out=margin).astype(np.float32)
     return df
 
+# Points across all monthly trend lines beyond which the chart is drawn on a WebGL canvas
+WEBGL_MIN_POINTS = 500
+
+def top_k_by(df, col, k, largest=True):
+    """The k rows with the largest (or smallest) `col`, best first, picked with a partial partition
+    instead of a full sort; ties keep row order like nlargest, and missing values rank last"""
+    values = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    values = np.nan_to_num(values if largest else -values, nan=-np.inf)
+    if len(values) > k:
+        kth = np.partition(values, -k)[-k]
+        candidates = np.flatnonzero(values >= kth)
+    else:
+        candidates = np.arange(len(values))
+    return df.iloc[candidates[np.argsort(-values[candidates], kind='stable')][:k]]
+
+def category_cross_sum(df, row, col, value):
+    """Sum of `value` for every observed (`row`, `col`) pair of two categorical columns, in the same
+    long layout and order as groupby([row, col], observed=True).sum(), accumulated with one
+    bincount over the combined category codes"""
+    row_codes = df[row].cat.codes.to_numpy().astype(np.intp)
+    col_codes = df[col].cat.codes.to_numpy().astype(np.intp)
+    row_labels = df[row].cat.categories
+    col_labels = df[col].cat.categories
+    # Rows missing either label (code -1) drop out, as they do from a groupby
+    labelled = (row_codes >= 0) & (col_codes >= 0)
+    cells = row_codes[labelled] * len(col_labels) + col_codes[labelled]
+    n_cells = len(row_labels) * len(col_labels)
+    totals = np.bincount(cells, weights=np.nan_to_num(df[value].to_numpy(dtype=np.float64)[labelled]), minlength=n_cells)
+    observed = np.flatnonzero(np.bincount(cells, minlength=n_cells))
+    row_idx, col_idx = np.divmod(observed, len(col_labels))
+    return pd.DataFrame({
+        row: pd.Categorical.from_codes(row_idx, dtype=df[row].dtype),
+        col: pd.Categorical.from_codes(col_idx, dtype=df[col].dtype),
+        value: totals[observed]
+    })
+
+def _slice_fingerprint(df):
+    """Identify a filtered slice without hashing every row: the sidebar filters keep every row in
+    the slice's date span whose category is in the slice, so these values pin down the rows exactly
+    for a given export; the export's version tells regenerated exports apart"""
+    return (
+        data_version(),
+        len(df),
+        df['Sold Date'].min(),
+        df['Sold Date'].max(),
+        tuple(sorted(df['openai_category'].dropna().unique()))
+    )
+
+@st.cache_data(hash_funcs={pd.DataFrame: _slice_fingerprint})
+def totals(df):
+    """Headline sums and means for the metric cards, from one reduction over the money columns"""
+    stats = df[['Item Price', 'Profit', 'Profit Margin', 'Seller Shipping Fee']].agg(['sum', 'mean'])
+    return {
+        'revenue': stats.at['sum', 'Item Price'],
+        'profit': stats.at['sum', 'Profit'],
+        'avg_price': stats.at['mean', 'Item Price'],
+        'avg_margin': stats.at['mean', 'Profit Margin'],
+        'avg_shipping': stats.at['mean', 'Seller Shipping Fee'],
+        'items': len(df)
+    }
+
+@st.cache_data(hash_funcs={pd.DataFrame: _slice_fingerprint})
+def aggregates(df):
+    """Rollups shared by the tabs, computed once per filtered slice instead of on every rerun"""
+    # Every per-category metric the tabs use, from a single pass over the group keys
+    by_category = df.groupby('openai_category', observed=True).agg(
+        revenue=('Item Price', 'sum'),
+        profit=('Profit', 'sum'),
+        avg_price=('Item Price', 'mean'),
+        count=('Item Price', 'count'),
+        volume=('Item Price', 'size'),
+        margin=('Profit Margin', 'mean')
+    )
+    
+    # Per-state revenue and order count in one pass; the average order value follows from the two
+    state_data = df.groupby('Shipped to State', observed=True).agg(
+        **{'Total Revenue': ('Item Price', 'sum'), 'Order Count': ('Item Id', 'count')}
+    ).rename_axis('State').reset_index()
+    state_data['Avg Order Value'] = state_data['Total Revenue'] / state_data['Order Count']
+    
+    regional_stats = df.groupby('Region', observed=True)['Item Price'].agg(
+        **{'Total Revenue': 'sum', 'Avg Price': 'mean', 'Order Count': 'count'}
+    ).round(2)
+    regional_stats = regional_stats.sort_values('Total Revenue', ascending=False).reset_index()
+    region_category = category_cross_sum(df, 'Region', 'openai_category', 'Item Price')
+    
+    # Months are grouped on the integer key built at load; labels are formatted only for the unique months
+    monthly = df.groupby(['Month Key', 'openai_category'], observed=True)['Item Price'].sum()
+    monthly = monthly[monthly.index.get_level_values('Month Key') != NO_MONTH].reset_index()
+    monthly.insert(0, 'Month', np.datetime_as_string(monthly.pop('Month Key').to_numpy().astype('datetime64[M]')))
+    
+    sub_perf = df.groupby(['openai_category', 'openai_subcategory'], observed=True).agg(
+        **{'Total Revenue': ('Item Price', 'sum')}
+    ).round(2)
+    
+    # Box plot inputs: quartiles, Tukey fences and the few points beyond them, so the chart
+    # gets a handful of numbers per category instead of every sale
+    prices = df.groupby('openai_category', observed=True)['Item Price']
+    # Reindexed so an empty slice still gets the three quartile columns
+    price_box = prices.quantile([0.25, 0.5, 0.75]).unstack().reindex(columns=[0.25, 0.5, 0.75])
+    price_box.columns = ['q1', 'median', 'q3']
+    price_box['mean'] = prices.mean()
+    iqr = price_box['q3'] - price_box['q1']
+    low = df['openai_category'].map(price_box['q1'] - 1.5 * iqr).astype(float)
+    high = df['openai_category'].map(price_box['q3'] + 1.5 * iqr).astype(float)
+    inside = df['Item Price'].between(low, high)
+    # Whiskers end at the furthest sale inside the fences, as plotly draws them
+    price_box['lowerfence'] = df['Item Price'].where(inside).groupby(df['openai_category'], observed=True, sort=False).min()
+    price_box['upperfence'] = df['Item Price'].where(inside).groupby(df['openai_category'], observed=True, sort=False).max()
+    # Sales without a category have no box (nor fences) to fall outside of
+    price_outliers = df.loc[
+        ~inside & df['Item Price'].notna() & df['openai_category'].notna(), ['openai_category', 'Item Price']
+    ]
+    
+    # Thresholds the recommendations compare against: the top-decile price cut with the average
+    # margin of the sales at or above it, and the median category volume and margin
+    high_value_threshold = df['Item Price'].quantile(0.9)
+    summary = {
+        'p90_price': high_value_threshold,
+        'high_value_margin': df.loc[df['Item Price'] >= high_value_threshold, 'Profit Margin'].mean(),
+        'median_volume': by_category['count'].median(),
+        'median_margin': by_category['margin'].median()
+    }
+    
+    aggs = {
+        'totals': totals(df),
+        'by_cat': by_category,
+        'by_state': state_data,
+        'by_region': regional_stats,
+        'region_category': region_category,
+        'monthly_category': monthly,
+        'sub_perf': sub_perf,
+        'price_box': price_box,
+        'price_outliers': price_outliers,
+        'summary': summary,
+        'by_day': None,
+        'by_season': None,
+        'season_category': None
+    }
+    
+    if 'day_of_week' in df.columns:
+        aggs['by_day'] = df.groupby('day_of_week', observed=True)['Item Price'].agg(**PERIOD_STATS)
+    
+    if 'season' in df.columns:
+        aggs['by_season'] = df.groupby('season', observed=True)['Item Price'].agg(**PERIOD_STATS)
+        aggs['season_category'] = category_cross_sum(df, 'season', 'openai_category', 'Item Price')
+    
+    return aggs
+
 # Main dashboard
+def chart(name, build):
+    """Draw the figure build() returns. Figures are kept per session alongside the filtered slice,
+    so reruns with unchanged filters skip the plotly express traversal and validation as well"""
+    figures = st.session_state.setdefault('figures', {})
+    if name not in figures:
+        figures[name] = build()
+    st.plotly_chart(figures[name], use_container_width=True)
+
 def main():
     # Enhanced title with gradient styling
     st.markdown("""
@@ -63,7 +353,8 @@ def main():
     """, unsafe_allow_html=True)
     
     # Load data
-    df = load_data()
+    version = data_version()
+    df = load_data(version)
     
     # Sidebar filters
     st.sidebar.markdown("""
@@ -90,90 +381,94 @@ def main():
     # Add some metrics to sidebar
     st.sidebar.markdown("---")
     st.sidebar.markdown("### 📊 Quick Stats")
-    total_revenue = df['Item Price'].sum()
-    total_items = len(df)
-    avg_price = df['Item Price'].mean()
-    
-    st.sidebar.metric("Total Revenue", f"${total_revenue:,.2f}")
-    st.sidebar.metric("Total Items", f"{total_items:,}")
-    st.sidebar.metric("Avg Item Price", f"${avg_price:.2f}")
-    
-    # Apply filters
-    filtered_df = df[
-        (df['Sold Date'] >= pd.to_datetime(date_range[0])) &
-        (df['Sold Date'] <= pd.to_datetime(date_range[1])) &
-        (df['openai_category'].isin(categories))
-    ]
-    
-    # Main content tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "📈 Revenue Analytics", 
-        "🎯 Category Intelligence", 
-        "🗺️ Geographic Insights", 
-        "💡 Recommendations"
-    ])
-    
-    with tab1:
-        revenue_analytics(filtered_df)
-    
-    with tab2:
-        category_intelligence(filtered_df)
-    
-    with tab3:
-        geographic_insights(filtered_df)
-    
-    with tab4:
-        recommendations(filtered_df)
+    quick_stats = totals(df)
+    
+    st.sidebar.metric("Total Revenue", f"${quick_stats['revenue']:,.2f}")
+    st.sidebar.metric("Total Items", f"{quick_stats['items']:,}")
+    st.sidebar.metric("Avg Item Price", f"${quick_stats['avg_price']:.2f}")
+    
+    # Reruns that leave the filters alone (switching views, reopening the page) reuse this
+    # session's slice and rollups without even fingerprinting the slice again
+    filter_key = (version, tuple(map(str, date_range)), tuple(sorted(map(str, categories))))
+    if st.session_state.get('filter_key') == filter_key:
+        filtered_df, aggs = st.session_state['filtered']
+    else:
+        # Apply filters: rows are sorted by date, so the date range is a contiguous slice and only
+        # that slice needs the category mask
+        sold_dates = df['Sold Date'].to_numpy()
+        start = np.searchsorted(sold_dates, np.datetime64(pd.to_datetime(date_range[0])), side='left')
+        end = np.searchsorted(sold_dates, np.datetime64(pd.to_datetime(date_range[1])), side='right')
+        date_slice = df.iloc[start:end]
+        # Match categories on their integer codes; with every category selected (the default) the
+        # date slice is used as is, so no rows are copied at all
+        category_codes = date_slice['openai_category'].cat
+        keep = np.isin(category_codes.codes.to_numpy(), category_codes.categories.get_indexer(categories))
+        filtered_df = date_slice if keep.all() else date_slice[keep]
+        
+        aggs = aggregates(filtered_df)
+        st.session_state['filter_key'] = filter_key
+        st.session_state['filtered'] = (filtered_df, aggs)
+        st.session_state['figures'] = {}
+    
+    # Main content views: only the selected one runs, where st.tabs would execute all four bodies
+    # (and build all their figures) on every rerun just to show one of them
+    views = {
+        "📈 Revenue Analytics": revenue_analytics,
+        "🎯 Category Intelligence": category_intelligence,
+        "🗺️ Geographic Insights": geographic_insights,
+        "💡 Recommendations": recommendations
+    }
+    active_view = st.radio(
+        "View",
+        list(views),
+        horizontal=True,
+        key='active_tab',
+        label_visibility='collapsed'
+    )
+    views[active_view](filtered_df, aggs)
 
-def revenue_analytics(df):
+def revenue_analytics(df, aggs):
     st.header("💰 Revenue Analytics")
     
     col1, col2, col3, col4 = st.columns(4)
+    summary = aggs['totals']
     
     with col1:
-        total_revenue = df['Item Price'].sum()
-        st.metric("Total Revenue", f"${total_revenue:,.2f}")
+        st.metric("Total Revenue", f"${summary['revenue']:,.2f}")
     
     with col2:
-        total_profit = df['Profit'].sum()
-        st.metric("Total Profit", f"${total_profit:,.2f}")
+        st.metric("Total Profit", f"${summary['profit']:,.2f}")
     
     with col3:
-        avg_margin = df['Profit Margin'].mean()
-        st.metric("Avg Profit Margin", f"{avg_margin:.1f}%")
+        st.metric("Avg Profit Margin", f"{summary['avg_margin']:.1f}%")
     
     with col4:
-        total_items = len(df)
-        st.metric("Items Sold", f"{total_items:,}")
-    
-    # Revenue by category
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("Revenue by Category")
-        category_revenue = df.groupby('openai_category')['Item Price'].sum().sort_values(ascending=False)
-        fig = px.bar(
-            x=category_revenue.values,
-            y=category_revenue.index,
-            orientation='h',
-            title="Total Revenue by Category",
-            labels={'x': 'Revenue ($)', 'y': 'Category'}
+        st.metric("Items Sold", f"{summary['items']:,}")
+    
+    # Revenue and profit by category, as two facets of one figure built from a single long frame
+    st.subheader("Revenue and Profit by Category")
+    def figure():
+        category_money = aggs['by_cat'][['revenue', 'profit']].sort_values('revenue', ascending=False)
+        category_money.columns = ['Revenue ($)', 'Profit ($)']
+        category_money = category_money.reset_index().melt(
+            id_vars='openai_category', var_name='Metric', value_name='Amount'
         )
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with col2:
-        st.subheader("Profit by Category")
-        category_profit = df.groupby('openai_category')['Profit'].sum().sort_values(ascending=False)
         fig = px.bar(
-            x=category_profit.values,
-            y=category_profit.index,
+            category_money,
+            x='Amount',
+            y='openai_category',
+            facet_col='Metric',
             orientation='h',
-            title="Total Profit by Category",
-            labels={'x': 'Profit ($)', 'y': 'Category'},
-            color=category_profit.values,
+            title="Total Revenue and Profit by Category",
+            labels={'openai_category': 'Category'},
+            color='Amount',
             color_continuous_scale='Viridis'
         )
-        st.plotly_chart(fig, use_container_width=True)
+        # Each panel gets its own dollar axis, and just the metric name as its title
+        fig.update_xaxes(matches=None)
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split('=')[-1]))
+        return fig
+    chart('category_money', figure)
     
     # Temporal Analysis Section
     st.subheader("📅 Temporal Sales Patterns")
@@ -186,26 +481,22 @@ def revenue_analytics(df):
         
         # Check if day_of_week column exists
         if 'day_of_week' in df.columns:
-            # Define day order for proper sorting
-            day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            
-            # Calculate revenue by day of week
-            day_revenue = df.groupby('day_of_week')['Item Price'].sum()
-            
-            # Reorder by day of week
-            day_revenue = day_revenue.reindex([day for day in day_order if day in day_revenue.index])
+            # Revenue by day of week, already in calendar order
+            day_revenue = aggs['by_day']['Total Revenue'].drop('Unknown', errors='ignore')
             
             # Create visualization
-            fig = px.bar(
-                x=day_revenue.index,
-                y=day_revenue.values,
-                title="Revenue by Day of Week",
-                labels={'x': 'Day of Week', 'y': 'Revenue ($)'},
-                color=day_revenue.values,
-                color_continuous_scale='Blues'
-            )
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
+            def figure():
+                fig = px.bar(
+                    x=day_revenue.index,
+                    y=day_revenue.values,
+                    title="Revenue by Day of Week",
+                    labels={'x': 'Day of Week', 'y': 'Revenue ($)'},
+                    color=day_revenue.values,
+                    color_continuous_scale='Blues'
+                )
+                fig.update_layout(xaxis_tickangle=-45)
+                return fig
+            chart('day_revenue', figure)
         else:
             st.warning("Day of week data not available. Please regenerate your data with the latest version.")
     
@@ -215,52 +506,58 @@ def revenue_analytics(df):
         # Check if season column exists
         if 'season' in df.columns:
             # Calculate revenue by season
-            season_revenue = df.groupby('season')['Item Price'].sum()
+            season_revenue = aggs['by_season']['Total Revenue']
             
             # Create visualization
-            fig = px.pie(
-                values=season_revenue.values,
-                names=season_revenue.index,
-                title="Revenue Distribution by Season"
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            def figure():
+                fig = px.pie(
+                    values=season_revenue.values,
+                    names=season_revenue.index,
+                    title="Revenue Distribution by Season"
+                )
+                return fig
+            chart('season_revenue', figure)
         else:
             st.warning("Season data not available. Please regenerate your data with the latest version.")
     
     # Time series analysis
     st.subheader("Revenue Trends Over Time")
-    df['Month'] = df['Sold Date'].dt.to_period('M').astype(str)
-    monthly_revenue = df.groupby(['Month', 'openai_category'])['Item Price'].sum().reset_index()
-    
-    fig = px.line(
-        monthly_revenue,
-        x='Month',
-        y='Item Price',
-        color='openai_category',
-        title="Monthly Revenue by Category",
-        labels={'Item Price': 'Revenue ($)', 'Month': 'Month'}
-    )
-    fig.update_layout(xaxis_tickangle=-45)
-    st.plotly_chart(fig, use_container_width=True)
+    def figure():
+        monthly_revenue = aggs['monthly_category']
+        fig = px.line(
+            monthly_revenue,
+            x='Month',
+            y='Item Price',
+            color='openai_category',
+            title="Monthly Revenue by Category",
+            labels={'Item Price': 'Revenue ($)', 'Month': 'Month'},
+            # Many long lines draw faster on a WebGL canvas than as SVG paths
+            render_mode='webgl' if len(monthly_revenue) > WEBGL_MIN_POINTS else 'auto'
+        )
+        fig.update_layout(xaxis_tickangle=-45)
+        return fig
+    chart('monthly_trend', figure)
     
     # Seasonal Trends by Category (simplified)
     if 'season' in df.columns:
         st.subheader("🔍 Seasonal Trends by Category")
         
         # Calculate seasonal performance by category
-        season_category = df.groupby(['season', 'openai_category'])['Item Price'].sum().reset_index()
+        season_category = aggs['season_category']
         
-        fig = px.bar(
-            season_category,
-            x='season',
-            y='Item Price',
-            color='openai_category',
-            title="Seasonal Revenue by Category",
-            labels={'Item Price': 'Revenue ($)', 'season': 'Season'}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def figure():
+            fig = px.bar(
+                season_category,
+                x='season',
+                y='Item Price',
+                color='openai_category',
+                title="Seasonal Revenue by Category",
+                labels={'Item Price': 'Revenue ($)', 'season': 'Season'}
+            )
+            return fig
+        chart('season_category', figure)
 
-def category_intelligence(df):
+def category_intelligence(df, aggs):
     st.header("🎯 Category Intelligence")
     
     col1, col2 = st.columns(2)
@@ -269,61 +566,83 @@ def category_intelligence(df):
         st.subheader("Category Performance Overview")
         
         # Category volume vs average price scatter plot
-        category_metrics = df.groupby('openai_category').agg({
-            'Item Price': ['mean', 'count'],
-            'Profit Margin': 'mean'
+        category_metrics = pd.DataFrame({
+            'Avg Price': aggs['by_cat']['avg_price'],
+            'Volume': aggs['by_cat']['count'],
+            'Avg Margin': aggs['by_cat']['margin']
         }).round(2)
         
-        category_metrics.columns = ['Avg Price', 'Volume', 'Avg Margin']
-        
-        fig = px.scatter(
-            category_metrics,
-            x='Volume',
-            y='Avg Price',
-            size='Avg Margin',
-            hover_name=category_metrics.index,
-            title="Category Volume vs Average Price",
-            labels={'Volume': 'Number of Items Sold', 'Avg Price': 'Average Price ($)'}
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def figure():
+            fig = px.scatter(
+                category_metrics,
+                x='Volume',
+                y='Avg Price',
+                size='Avg Margin',
+                hover_name=category_metrics.index,
+                title="Category Volume vs Average Price",
+                labels={'Volume': 'Number of Items Sold', 'Avg Price': 'Average Price ($)'}
+            )
+            return fig
+        chart('category_scatter', figure)
     
     with col2:
         st.subheader("Price Distribution by Category")
         
-        # Box plot of prices by category
-        fig = px.box(
-            df,
-            x='openai_category',
-            y='Item Price',
-            title="Price Distribution by Category"
-        )
-        fig.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig, use_container_width=True)
+        # Box plot of prices by category, drawn from the precomputed quartiles: one trace holds every
+        # category's box and one marker trace every outlier, however many categories there are
+        price_box = aggs['price_box']
+        outliers = aggs['price_outliers']
+        def figure():
+            fig = go.Figure([
+                go.Box(
+                    x=price_box.index.astype(str),
+                    q1=price_box['q1'],
+                    median=price_box['median'],
+                    q3=price_box['q3'],
+                    lowerfence=price_box['lowerfence'],
+                    upperfence=price_box['upperfence'],
+                    mean=price_box['mean'],
+                    marker_color='#636efa',
+                    showlegend=False
+                ),
+                go.Scatter(
+                    x=outliers['openai_category'].astype(str),
+                    y=outliers['Item Price'],
+                    mode='markers',
+                    marker_color='#636efa',
+                    showlegend=False
+                )
+            ])
+            fig.update_layout(
+                title="Price Distribution by Category",
+                xaxis_title='openai_category',
+                yaxis_title='Item Price'
+            )
+            fig.update_layout(xaxis_tickangle=-45)
+            return fig
+        chart('price_box', figure)
     
     # Top Subcategories Visualization
     st.subheader("Top Performing Subcategories")
     
-    subcategory_perf = df.groupby(['openai_category', 'openai_subcategory']).agg({
-        'Item Price': 'sum'
-    }).round(2)
-    
-    subcategory_perf.columns = ['Total Revenue']
-    subcategory_perf = subcategory_perf.sort_values('Total Revenue', ascending=False).head(15).reset_index()
+    subcategory_perf = top_k_by(aggs['sub_perf'], 'Total Revenue', 15).reset_index()
     
     # Create a combined category-subcategory label for better visualization
-    subcategory_perf['Category_Subcategory'] = subcategory_perf['openai_category'] + ' - ' + subcategory_perf['openai_subcategory']
-    
-    fig = px.bar(
-        subcategory_perf,
-        x='Total Revenue',
-        y='Category_Subcategory',
-        orientation='h',
-        title="Top 15 Subcategories by Revenue",
-        labels={'Total Revenue': 'Revenue ($)', 'Category_Subcategory': 'Category - Subcategory'},
-        color='Total Revenue',
-        color_continuous_scale='Viridis'
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    subcategory_perf['Category_Subcategory'] = subcategory_perf['openai_category'].astype(str) + ' - ' + subcategory_perf['openai_subcategory'].astype(str)
+    
+    def figure():
+        fig = px.bar(
+            subcategory_perf,
+            x='Total Revenue',
+            y='Category_Subcategory',
+            orientation='h',
+            title="Top 15 Subcategories by Revenue",
+            labels={'Total Revenue': 'Revenue ($)', 'Category_Subcategory': 'Category - Subcategory'},
+            color='Total Revenue',
+            color_continuous_scale='Viridis'
+        )
+        return fig
+    chart('top_subcategories', figure)
     
     # Category Rankings Visualization
     st.subheader("Category Rankings")
@@ -332,152 +651,129 @@ def category_intelligence(df):
     
     with col1:
         # Top by revenue
-        top_revenue = df.groupby('openai_category')['Item Price'].sum().sort_values(ascending=False).head(8)
-        fig = px.bar(
-            x=top_revenue.values,
-            y=top_revenue.index,
-            orientation='h',
-            title="Top Categories by Revenue",
-            labels={'x': 'Revenue ($)', 'y': 'Category'},
-            color=top_revenue.values,
-            color_continuous_scale='Blues'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        top_revenue = top_k_by(aggs['by_cat'], 'revenue', 8)['revenue']
+        def figure():
+            fig = px.bar(
+                x=top_revenue.values,
+                y=top_revenue.index,
+                orientation='h',
+                title="Top Categories by Revenue",
+                labels={'x': 'Revenue ($)', 'y': 'Category'},
+                color=top_revenue.values,
+                color_continuous_scale='Blues'
+            )
+            return fig
+        chart('top_revenue', figure)
     
     with col2:
         # Top by margin
-        top_margin = df.groupby('openai_category')['Profit Margin'].mean().sort_values(ascending=False).head(8)
-        fig = px.bar(
-            x=top_margin.values,
-            y=top_margin.index,
-            orientation='h',
-            title="Top Categories by Avg Margin",
-            labels={'x': 'Margin (%)', 'y': 'Category'},
-            color=top_margin.values,
-            color_continuous_scale='Greens'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        top_margin = top_k_by(aggs['by_cat'], 'margin', 8)['margin']
+        def figure():
+            fig = px.bar(
+                x=top_margin.values,
+                y=top_margin.index,
+                orientation='h',
+                title="Top Categories by Avg Margin",
+                labels={'x': 'Margin (%)', 'y': 'Category'},
+                color=top_margin.values,
+                color_continuous_scale='Greens'
+            )
+            return fig
+        chart('top_margin', figure)
     
     with col3:
         # Top by volume
-        top_volume = df.groupby('openai_category').size().sort_values(ascending=False).head(8)
-        fig = px.bar(
-            x=top_volume.values,
-            y=top_volume.index,
-            orientation='h',
-            title="Top Categories by Volume",
-            labels={'x': 'Items Sold', 'y': 'Category'},
-            color=top_volume.values,
-            color_continuous_scale='Oranges'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        top_volume = top_k_by(aggs['by_cat'], 'volume', 8)['volume']
+        def figure():
+            fig = px.bar(
+                x=top_volume.values,
+                y=top_volume.index,
+                orientation='h',
+                title="Top Categories by Volume",
+                labels={'x': 'Items Sold', 'y': 'Category'},
+                color=top_volume.values,
+                color_continuous_scale='Oranges'
+            )
+            return fig
+        chart('top_volume', figure)
 
-def geographic_insights(df):
+def geographic_insights(df, aggs):
     st.header("🗺️ Geographic Insights")
     
-    # Prepare state data for analysis
-    state_data = df.groupby('Shipped to State').agg({
-        'Item Price': 'sum',
-        'Item Id': 'count'
-    }).reset_index()
-    
-    state_data.columns = ['State', 'Total Revenue', 'Order Count']
-    state_data['Avg Order Value'] = state_data['Total Revenue'] / state_data['Order Count']
+    state_data = aggs['by_state']
     
     # State performance details
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("📊 Top States by Revenue")
-        top_states = state_data.nlargest(10, 'Total Revenue')
+        top_states = top_k_by(state_data, 'Total Revenue', 10)
         
-        fig = px.bar(
-            top_states,
-            x='Total Revenue',
-            y='State',
-            orientation='h',
-            title="Top 10 States by Revenue",
-            labels={'Total Revenue': 'Revenue ($)', 'State': 'State'},
-            color='Total Revenue',
-            color_continuous_scale='Viridis'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def figure():
+            fig = px.bar(
+                top_states,
+                x='Total Revenue',
+                y='State',
+                orientation='h',
+                title="Top 10 States by Revenue",
+                labels={'Total Revenue': 'Revenue ($)', 'State': 'State'},
+                color='Total Revenue',
+                color_continuous_scale='Viridis'
+            )
+            return fig
+        chart('top_states', figure)
     
     with col2:
         st.subheader("💰 Average Order Value by State")
-        top_aov_states = state_data.nlargest(10, 'Avg Order Value')
+        top_aov_states = top_k_by(state_data, 'Avg Order Value', 10)
         
-        fig = px.bar(
-            top_aov_states,
-            x='Avg Order Value',
-            y='State',
-            orientation='h',
-            title="Top 10 States by Average Order Value",
-            labels={'Avg Order Value': 'AOV ($)', 'State': 'State'},
-            color='Avg Order Value',
-            color_continuous_scale='Plasma'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        def figure():
+            fig = px.bar(
+                top_aov_states,
+                x='Avg Order Value',
+                y='State',
+                orientation='h',
+                title="Top 10 States by Average Order Value",
+                labels={'Avg Order Value': 'AOV ($)', 'State': 'State'},
+                color='Avg Order Value',
+                color_continuous_scale='Plasma'
+            )
+            return fig
+        chart('top_aov_states', figure)
     
     # Regional Analysis
     st.subheader("🏙️ Regional Performance Analysis")
     
-    # Regional grouping
-    region_mapping = {
-        'California': 'West', 'Washington': 'West', 'Oregon': 'West', 'Nevada': 'West',
-        'Arizona': 'West', 'Utah': 'West', 'Colorado': 'West', 'New Mexico': 'West',
-        'Wyoming': 'West', 'Montana': 'West', 'Idaho': 'West', 'Alaska': 'West', 'Hawaii': 'West',
-        
-        'Texas': 'South', 'Florida': 'South', 'Georgia': 'South', 'North Carolina': 'South',
-        'South Carolina': 'South', 'Virginia': 'South', 'Tennessee': 'South', 'Kentucky': 'South',
-        'Alabama': 'South', 'Mississippi': 'South', 'Arkansas': 'South', 'Louisiana': 'South',
-        'Oklahoma': 'South', 'West Virginia': 'South', 'Maryland': 'South', 'Delaware': 'South',
-        'District of Columbia': 'South',
-        
-        'New York': 'Northeast', 'Pennsylvania': 'Northeast', 'Massachusetts': 'Northeast',
-        'Connecticut': 'Northeast', 'Rhode Island': 'Northeast', 'Vermont': 'Northeast',
-        'New Hampshire': 'Northeast', 'Maine': 'Northeast', 'New Jersey': 'Northeast',
-        
-        'Illinois': 'Midwest', 'Ohio': 'Midwest', 'Michigan': 'Midwest', 'Indiana': 'Midwest',
-        'Wisconsin': 'Midwest', 'Minnesota': 'Midwest', 'Iowa': 'Midwest', 'Missouri': 'Midwest',
-        'North Dakota': 'Midwest', 'South Dakota': 'Midwest', 'Nebraska': 'Midwest', 'Kansas': 'Midwest'
-    }
     
-    df['Region'] = df['Shipped to State'].map(region_mapping).fillna('Other')
-    
-    regional_stats = df.groupby('Region').agg({
-        'Item Price': ['sum', 'mean', 'count']
-    }).round(2)
-    
-    regional_stats.columns = ['Total Revenue', 'Avg Price', 'Order Count']
-    regional_stats = regional_stats.sort_values('Total Revenue', ascending=False).reset_index()
+    regional_stats = aggs['by_region']
     
     # Regional performance chart
-    fig = px.bar(
-        regional_stats,
-        x='Region',
-        y='Total Revenue',
-        title="Revenue by Region",
-        labels={'Total Revenue': 'Revenue ($)', 'Region': 'Region'},
-        color='Total Revenue',
-        color_continuous_scale='Blues'
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    def figure():
+        fig = px.bar(
+            regional_stats,
+            x='Region',
+            y='Total Revenue',
+            title="Revenue by Region",
+            labels={'Total Revenue': 'Revenue ($)', 'Region': 'Region'},
+            color='Total Revenue',
+            color_continuous_scale='Blues'
+        )
+        return fig
+    chart('region_revenue', figure)
     
     # Category preferences by region
     st.subheader("🎯 Category Preferences by Region")
     
-    region_category = df.groupby(['Region', 'openai_category'])['Item Price'].sum().reset_index()
-    
     # Create sunburst chart
-    fig = px.sunburst(
-        region_category,
-        path=['Region', 'openai_category'],
-        values='Item Price',
-        title="Revenue Distribution: Region → Category"
-    )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    def figure():
+        fig = px.sunburst(
+            aggs['region_category'],
+            path=['Region', 'openai_category'],
+            values='Item Price',
+            title="Revenue Distribution: Region → Category"
+        )
+        return fig
+    chart('region_sunburst', figure)
     
     # Geographic insights summary
     st.subheader("📈 Geographic Performance Insights")
@@ -508,14 +804,13 @@ def geographic_insights(df):
             "Geographic Coverage"
         )
 
-def recommendations(df):
+def recommendations(df, aggs):
     st.header("💡 Strategic Recommendations")
     
     # Calculate key insights
-    total_revenue = df['Item Price'].sum()
-    category_revenue = df.groupby('openai_category')['Item Price'].sum().sort_values(ascending=False)
-    category_margins = df.groupby('openai_category')['Profit Margin'].mean().sort_values(ascending=False)
-    category_volume = df.groupby('openai_category').size().sort_values(ascending=False)
+    total_revenue = aggs['totals']['revenue']
+    category_revenue = top_k_by(aggs['by_cat'], 'revenue', 3)['revenue']
+    category_volume = aggs['by_cat']['volume']
     
     col1, col2 = st.columns(2)
     
@@ -523,55 +818,59 @@ def recommendations(df):
         st.subheader("🎯 Focus Areas")
         
         st.markdown("### Top Revenue Categories")
-        for i, (category, revenue) in enumerate(category_revenue.head(3).items(), 1):
-            pct = (revenue / total_revenue) * 100
-            st.write(f"{i}. **{category}**: ${revenue:,.2f} ({pct:.1f}% of total revenue)")
+        st.markdown("  \n".join(
+            f"{i}. **{category}**: ${revenue:,.2f} ({revenue / total_revenue * 100:.1f}% of total revenue)"
+            for i, (category, revenue) in enumerate(category_revenue.items(), 1)
+        ))
         
         st.markdown("### High-Margin Opportunities")
-        high_margin_cats = category_margins.head(3)
-        for category, margin in high_margin_cats.items():
-            volume = category_volume.get(category, 0)
-            st.write(f"• **{category}**: {margin:.1f}% margin ({volume} items sold)")
+        high_margin_cats = top_k_by(aggs['by_cat'], 'margin', 3)['margin']
+        st.markdown("  \n".join(
+            f"• **{category}**: {margin:.1f}% margin ({category_volume.get(category, 0)} items sold)"
+            for category, margin in high_margin_cats.items()
+        ))
         
         st.markdown("### Geographic Expansion")
-        top_states = df.groupby('Shipped to State')['Item Price'].sum().sort_values(ascending=False).head(3)
-        st.write("**Top performing states to prioritize:**")
-        for state, revenue in top_states.items():
-            st.write(f"• {state}: ${revenue:,.2f}")
+        top_states = top_k_by(aggs['by_state'], 'Total Revenue', 3).set_index('State')['Total Revenue']
+        st.markdown("  \n".join(
+            ["**Top performing states to prioritize:**"] +
+            [f"• {state}: ${revenue:,.2f}" for state, revenue in top_states.items()]
+        ))
     
     with col2:
         st.subheader("⚠️ Areas for Improvement")
         
         st.markdown("### Low Revenue Categories")
-        low_revenue_categories = df.groupby('openai_category')['Item Price'].sum().sort_values().head(3)
-        st.write("**Categories with low total revenue that may need attention:**")
-        for category, revenue in low_revenue_categories.items():
-            st.write(f"• {category}: ${revenue:.2f} total revenue")
+        low_revenue_categories = top_k_by(aggs['by_cat'], 'revenue', 3, largest=False)['revenue']
+        st.markdown("  \n".join(
+            ["**Categories with low total revenue that may need attention:**"] +
+            [f"• {category}: ${revenue:.2f} total revenue" for category, revenue in low_revenue_categories.items()]
+        ))
         
         st.markdown("### Underperforming Categories")
         # Categories with low volume but decent margins
-        cat_metrics = df.groupby('openai_category').agg({
-            'Item Price': 'count',
-            'Profit Margin': 'mean'
-        })
-        underperforming = cat_metrics[
-            (cat_metrics['Item Price'] < cat_metrics['Item Price'].median()) &
-            (cat_metrics['Profit Margin'] > cat_metrics['Profit Margin'].median())
-        ].sort_values('Profit Margin', ascending=False)
+        by_cat = aggs['by_cat']
+        underperforming = by_cat[
+            (by_cat['count'] < aggs['summary']['median_volume']) &
+            (by_cat['margin'] > aggs['summary']['median_margin'])
+        ]
+        underperforming = top_k_by(underperforming, 'margin', 3)[['count', 'margin']]
         
-        st.write("**Categories with potential for increased inventory:**")
-        for category in underperforming.head(3).index:
-            volume = underperforming.loc[category, 'Item Price']
-            margin = underperforming.loc[category, 'Profit Margin']
-            st.write(f"• {category}: Only {volume} items, {margin:.1f}% margin")
+        st.markdown("  \n".join(
+            ["**Categories with potential for increased inventory:**"] +
+            [f"• {category}: Only {volume} items, {margin:.1f}% margin"
+             for category, volume, margin in underperforming.itertuples(name=None)]
+        ))
         
         st.markdown("### Price Optimization Opportunities")
         # Categories with low average prices
-        low_price_categories = df.groupby('openai_category')['Item Price'].mean().sort_values().head(3)
-        st.write("**Categories that might benefit from premium positioning:**")
-        for category, avg_price in low_price_categories.items():
-            count = df[df['openai_category'] == category]['Item Price'].count()
-            st.write(f"• {category}: ${avg_price:.2f} avg price ({count} items)")
+        low_price_categories = top_k_by(aggs['by_cat'], 'avg_price', 3, largest=False)['avg_price']
+        category_count = aggs['by_cat']['count']
+        st.markdown("  \n".join(
+            ["**Categories that might benefit from premium positioning:**"] +
+            [f"• {category}: ${avg_price:.2f} avg price ({category_count[category]} items)"
+             for category, avg_price in low_price_categories.items()]
+        ))
     
     # Temporal Strategic Insights
     if 'day_of_week' in df.columns and 'season' in df.columns:
@@ -583,19 +882,22 @@ def recommendations(df):
             st.markdown("### Day of Week Optimization")
             
             # Best performing days
-            day_performance = df.groupby('day_of_week')['Item Price'].agg(['sum', 'count', 'mean'])
-            day_performance.columns = ['Total Revenue', 'Sales Count', 'Avg Sale Price']
+            day_performance = aggs['by_day']
             
-            # Sort by total revenue
-            best_days = day_performance.sort_values('Total Revenue', ascending=False)
+            # Three strongest days by revenue
+            best_days = top_k_by(day_performance, 'Total Revenue', 3)
             
-            st.write("**Best performing days for sales:**")
-            for i, (day, row) in enumerate(best_days.head(3).iterrows(), 1):
-                st.write(f"{i}. **{day}**: ${row['Total Revenue']:,.2f} total revenue ({row['Sales Count']} sales)")
+            st.markdown("  \n".join(
+                ["**Best performing days for sales:**"] +
+                [f"{i}. **{day}**: ${revenue:,.2f} total revenue ({count} sales)"
+                 for i, (day, revenue, count) in enumerate(
+                     best_days[['Total Revenue', 'Sales Count']].itertuples(name=None), 1)]
+            ))
             
             # Recommendations based on day patterns
-            weekday_revenue = df[df['day_of_week'].isin(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday'])]['Item Price'].sum()
-            weekend_revenue = df[df['day_of_week'].isin(['Saturday', 'Sunday'])]['Item Price'].sum()
+            day_revenue = day_performance['Total Revenue']
+            weekday_revenue = day_revenue.reindex(DAY_ORDER[:5]).sum()
+            weekend_revenue = day_revenue.reindex(DAY_ORDER[5:]).sum()
             
             if weekend_revenue > weekday_revenue:
                 st.info("💡 **Weekend Focus**: Your weekend sales outperform weekdays. Consider promoting weekend-specific items or running weekend sales.")
@@ -606,16 +908,18 @@ def recommendations(df):
             st.markdown("### Seasonal Strategy")
             
             # Best performing seasons
-            season_performance = df.groupby('season')['Item Price'].agg(['sum', 'count', 'mean'])
-            season_performance.columns = ['Total Revenue', 'Sales Count', 'Avg Sale Price']
+            season_performance = aggs['by_season']
             
             # Sort by total revenue
             best_seasons = season_performance.sort_values('Total Revenue', ascending=False)
             
-            st.write("**Peak seasons for your business:**")
-            for i, (season, row) in enumerate(best_seasons.iterrows(), 1):
-                if season != 'Unknown':
-                    st.write(f"{i}. **{season}**: ${row['Total Revenue']:,.2f} total revenue ({row['Sales Count']} sales)")
+            st.markdown("  \n".join(
+                ["**Peak seasons for your business:**"] +
+                [f"{i}. **{season}**: ${revenue:,.2f} total revenue ({count} sales)"
+                 for i, (season, revenue, count) in enumerate(
+                     best_seasons[['Total Revenue', 'Sales Count']].itertuples(name=None), 1)
+                 if season != 'Unknown']
+            ))
             
             # Seasonal recommendations
             top_season = best_seasons.index[0] if best_seasons.index[0] != 'Unknown' else best_seasons.index[1]
@@ -641,26 +945,27 @@ def recommendations(df):
         insights.append(f"🔸 **Diversification Opportunity**: {category_revenue.index[0]} represents {top_cat_pct:.1f}% of revenue. Consider expanding other categories to reduce risk.")
     
     # Insight 2: Shipping costs
-    avg_seller_shipping = df['Seller Shipping Fee'].mean()
+    avg_seller_shipping = aggs['totals']['avg_shipping']
     if avg_seller_shipping > 3:
         insights.append(f"🔸 **Shipping Optimization**: Average seller shipping cost is ${avg_seller_shipping:.2f}. Consider negotiating better rates or adjusting pricing strategy.")
     
     # Insight 3: High-value items
-    high_value_threshold = df['Item Price'].quantile(0.9)
-    high_value_margin = df[df['Item Price'] >= high_value_threshold]['Profit Margin'].mean()
+    high_value_threshold = aggs['summary']['p90_price']
+    high_value_margin = aggs['summary']['high_value_margin']
     insights.append(f"🔸 **Premium Strategy**: High-value items (>${high_value_threshold:.0f}+) have {high_value_margin:.1f}% average margin. Focus on premium product sourcing.")
     
     # Insight 4: Temporal patterns
     if 'day_of_week' in df.columns:
         # Check for day-of-week patterns
-        day_variance = df.groupby('day_of_week')['Item Price'].sum().std()
-        if day_variance > df['Item Price'].sum() * 0.1:  # High variance across days
-            best_day = df.groupby('day_of_week')['Item Price'].sum().idxmax()
+        day_revenue = aggs['by_day']['Total Revenue']
+        day_variance = day_revenue.std()
+        if day_variance > aggs['totals']['revenue'] * 0.1:  # High variance across days
+            best_day = day_revenue.idxmax()
             insights.append(f"🔸 **Timing Strategy**: Sales vary significantly by day of week. {best_day} is your strongest day - consider timing listings and promotions accordingly.")
     
     # Insight 5: Seasonal opportunities
     if 'season' in df.columns:
-        season_revenue = df.groupby('season')['Item Price'].sum()
+        season_revenue = aggs['by_season']['Total Revenue']
         if 'Unknown' in season_revenue.index:
             season_revenue = season_revenue.drop('Unknown')
         
@@ -671,8 +976,9 @@ def recommendations(df):
                 low_season = season_revenue.idxmin()
                 insights.append(f"🔸 **Seasonal Planning**: Strong seasonal patterns detected. {peak_season} is your peak season, while {low_season} may need targeted strategies or inventory adjustments.")
     
-    for insight in insights:
-        st.markdown(insight)
+    # One markdown element for all insights, each still its own paragraph
+    if insights:
+        st.markdown("\n\n".join(insights))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -17,7 +17,6 @@ import {
   Cell
 } from 'recharts';
 import { DashboardData } from '../../services/api';
-import { format } from 'date-fns';
 
 interface RevenueChartsProps {
   data: DashboardData;
@@ -53,38 +52,14 @@ const RevenueCharts: React.FC<RevenueChartsProps> = ({ data, compact = false })
     });
   }, [availableCategories]);
 
-  // Prepare monthly revenue data by category
+  // Monthly revenue by category, rolled up server-side
   const monthlyData = useMemo(() => {
-    const monthMap = new Map<string, Record<string, number>>();
-    
-    data.products.forEach(product => {
-      try {
-        const date = new Date(product['Sold Date']);
-        if (isNaN(date.getTime())) {
-          console.warn('Invalid date found:', product['Sold Date']);
-          return; // Skip this product
-        }
-        
-        const monthKey = format(date, 'MMM yyyy');
-        const category = product.openai_category || 'Unknown';
-        const revenue = product['Item Price'] || 0;
-      
-        if (!monthMap.has(monthKey)) {
-          monthMap.set(monthKey, {});
-        }
-        
-        const monthData = monthMap.get(monthKey)!;
-        monthData[category] = (monthData[category] || 0) + revenue;
-        monthData.total = (monthData.total || 0) + revenue;
-      } catch (dateError) {
-        console.warn('Error processing date for product:', product['Item Title'], dateError);
-      }
-    });
-    
-    return Array.from(monthMap.entries())
-      .map(([month, data]) => ({ month, ...data }))
-      .sort((a, b) => new Date(a.month).getTime() - new Date(b.month).getTime());
-  }, [data.products]);
+    return data.analytics.temporalPatterns.monthlyTrends.map(({ month, revenue, byCategory }) => ({
+      month,
+      ...byCategory,
+      total: revenue
+    }));
+  }, [data.analytics.temporalPatterns.monthlyTrends]);
 
   // Category revenue data for pie chart
   const categoryData = useMemo(() => {
@@ -45,32 +45,7 @@ const TemporalAnalysis: React.FC<TemporalAnalysisProps> = ({ data }) => {
     }));
 
     // Category distribution by season
-    const categoryBySeasonData = data.products.reduce((acc, product) => {
-      const season = product.season || 'Unknown';
-      const category = product.openai_category || 'Unknown';
-      const key = `${season}-${category}`;
-      
-      if (!acc[key]) {
-        acc[key] = { season, category, revenue: 0, count: 0 };
-      }
-      acc[key].revenue += product['Item Price'] || 0;
-      acc[key].count += 1;
-      return acc;
-    }, {} as Record<string, { season: string; category: string; revenue: number; count: number }>);
-
-    // Convert to array and group by season
-    const seasonalCategoryData = Object.values(categoryBySeasonData)
-      .reduce((acc, item) => {
-        if (!acc[item.season]) {
-          acc[item.season] = [];
-        }
-        acc[item.season].push({
-          category: item.category,
-          revenue: item.revenue,
-          count: item.count
-        });
-        return acc;
-      }, {} as Record<string, Array<{ category: string; revenue: number; count: number }>>);
+    const seasonalCategoryData = data.analytics.temporalPatterns.seasonalCategories || {};
 
     // Monthly trends
     const monthlyData = data.analytics.temporalPatterns.monthlyTrends || [];
@@ -214,7 +189,6 @@ const TemporalAnalysis: React.FC<TemporalAnalysisProps> = ({ data }) => {
               </h4>
               <div className="space-y-2">
                 {categories
-                  .sort((a, b) => b.revenue - a.revenue)
                   .slice(0, 5)
                   .map((cat, index) => (
                     <div key={index} className="flex justify-between text-sm">
@@ -30,8 +30,30 @@ export interface ProductData {
   [key: string]: any;
 }
 
-export interface DashboardData {
+export interface MonthlyTrend {
+  month: string;
+  revenue: number;
+  byCategory: Record<string, number>;
+}
+
+export interface SeasonCategoryRevenue {
+  category: string;
+  revenue: number;
+  count: number;
+}
+
+export interface ProductPage {
+  total: number;
+  offset: number;
+  limit: number;
   products: ProductData[];
+}
+
+export interface DashboardData {
+  // Rows are paged from productsUrl; charts only read the server-side analytics rollups
+  productsUrl?: string;
+  productCount: number;
+  products?: ProductData[];
   analytics: {
     totalRevenue: number;
     totalProfit: number;
@@ -41,7 +63,8 @@ export interface DashboardData {
     temporalPatterns: {
       dayOfWeek: Record<string, number>;
       seasonal: Record<string, number>;
-      monthlyTrends: Array<{ month: string; revenue: number; category: string }>;
+      monthlyTrends: MonthlyTrend[];
+      seasonalCategories: Record<string, SeasonCategoryRevenue[]>;
     };
     geographicData: {
       stateRevenue: Record<string, number>;
@@ -138,6 +161,27 @@ class ApiService {
     return response.json();
   }
 
+  // Get one page of categorized products
+  async getProducts(
+    analysisId: string,
+    options: { offset?: number; limit?: number; sort?: string; fields?: string[] } = {}
+  ): Promise<ProductPage> {
+    const params = new URLSearchParams({
+      offset: String(options.offset ?? 0),
+      limit: String(options.limit ?? 500),
+    });
+    if (options.sort) params.set('sort', options.sort);
+    if (options.fields?.length) params.set('fields', options.fields.join(','));
+
+    const response = await fetch(`${this.baseUrl}/api/analysis/${analysisId}/products?${params}`);
+
+    if (!response.ok) {
+      throw new Error(`Failed to get products: ${response.statusText}`);
+    }
+
+    return response.json();
+  }
+
   // Export processed data
   async exportData(analysisId: string, format: 'csv' | 'xlsx' | 'json' = 'csv'): Promise<Blob> {
     const response = await fetch(`${this.baseUrl}/api/export/${analysisId}?format=${format}`);
@@ -526,15 +570,45 @@ class MockApiService {
       regionRevenue[region] = (regionRevenue[region] || 0) + revenue;
     });
 
-    // Mock monthly trends
-    const monthlyTrends = Array.from({ length: 12 }, (_, i) => ({
-      month: new Date(2023, i, 1).toLocaleDateString('en-US', { month: 'short', year: 'numeric' }),
-      revenue: Math.floor(Math.random() * 50000) + 20000,
-      category: Object.keys(categoryDistribution)[0]
-    }));
+    // Monthly and season x category rollups, shaped like the backend's
+    const monthMap = new Map<string, { date: Date; byCategory: Record<string, number> }>();
+    const seasonCategory: Record<string, Record<string, SeasonCategoryRevenue>> = {};
+    products.forEach(p => {
+      const category = p.openai_category || 'Unknown';
+      const revenue = p['Item Price'] || 0;
+      const season = p.season || 'Unknown';
+
+      const date = new Date(p['Sold Date']);
+      if (!isNaN(date.getTime())) {
+        const monthKey = date.toLocaleDateString('en-US', { month: 'short', year: 'numeric' });
+        if (!monthMap.has(monthKey)) {
+          monthMap.set(monthKey, { date: new Date(date.getFullYear(), date.getMonth(), 1), byCategory: {} });
+        }
+        const byCategory = monthMap.get(monthKey)!.byCategory;
+        byCategory[category] = (byCategory[category] || 0) + revenue;
+      }
+
+      seasonCategory[season] = seasonCategory[season] || {};
+      const entry = seasonCategory[season][category] || { category, revenue: 0, count: 0 };
+      entry.revenue += revenue;
+      entry.count += 1;
+      seasonCategory[season][category] = entry;
+    });
+    const monthlyTrends: MonthlyTrend[] = Array.from(monthMap.entries())
+      .sort(([, a], [, b]) => a.date.getTime() - b.date.getTime())
+      .map(([month, { byCategory }]) => ({
+        month,
+        revenue: Object.values(byCategory).reduce((sum, value) => sum + value, 0),
+        byCategory
+      }));
+    const seasonalCategories: Record<string, SeasonCategoryRevenue[]> = {};
+    Object.entries(seasonCategory).forEach(([season, categories]) => {
+      seasonalCategories[season] = Object.values(categories).sort((a, b) => b.revenue - a.revenue);
+    });
 
     return {
       products,
+      productCount: products.length,
       analytics: {
         totalRevenue,
         totalProfit,
@@ -544,7 +618,8 @@ class MockApiService {
         temporalPatterns: {
           dayOfWeek,
           seasonal,
-          monthlyTrends
+          monthlyTrends,
+          seasonalCategories
         },
         geographicData: {
           stateRevenue,
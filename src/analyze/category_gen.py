@@ -8,6 +8,7 @@ import openai
 from openai import AsyncOpenAI
 import time
 import pandas as pd
+import numpy as np
 import os
 import json
 import asyncio
@@ -59,35 +60,12 @@ def normalize_titles(df, column_name):
             product_titles.append(str(title).strip().lower())
     return product_titles
 
-def extract_day_of_week(date):
-    """Extract day of the week from a date"""
-    try:
-        if pd.isna(date):
-            return "Unknown"
-        return date.strftime('%A')  # Returns full day name (e.g., 'Monday', 'Tuesday')
-    except:
-        return "Unknown"
-
-def extract_season(date):
-    """Extract season from a date based on month"""
-    try:
-        if pd.isna(date):
-            return "Unknown"
-        
-        month = date.month
-        
-        if month in [12, 1, 2]:
-            return "Winter"
-        elif month in [3, 4, 5]:
-            return "Spring"
-        elif month in [6, 7, 8]:
-            return "Summer"
-        elif month in [9, 10, 11]:
-            return "Fall"
-        else:
-            return "Unknown"
-    except:
-        return "Unknown"
+# Season for each calendar month, indexed by month number; slot 0 catches missing dates
+SEASON_LUT = np.array([
+    "Unknown",
+    "Winter", "Winter", "Spring", "Spring", "Spring", "Summer",
+    "Summer", "Summer", "Fall", "Fall", "Fall", "Winter"
+])
 
 def add_temporal_features(df):
     """Add day of week and season columns based on Sold Date"""
@@ -97,10 +75,11 @@ def add_temporal_features(df):
     df['Sold Date'] = pd.to_datetime(df['Sold Date'])
     
     # Extract day of the week
-    df['day_of_week'] = df['Sold Date'].apply(extract_day_of_week)
+    df['day_of_week'] = df['Sold Date'].dt.day_name().fillna("Unknown")
     
-    # Extract season
-    df['season'] = df['Sold Date'].apply(extract_season)
+    # Extract season by gathering from the month lookup table instead of branching per row
+    months = df['Sold Date'].dt.month.fillna(0).to_numpy(dtype=np.intp)
+    df['season'] = SEASON_LUT[months]
     
     print(f"Day of week distribution:")
     print(df['day_of_week'].value_counts())
@@ -194,13 +173,15 @@ Examples:
         if should_close and client:
             await client.close()
 
-async def generate_categories(df, api_tier="tier4", progress_callback=None):
+async def generate_categories(df, api_tier="tier4", progress_callback=None, concurrency=None):
     """
     Generate categories with configurable rate limits based on OpenAI tier
     
     Args:
         df: DataFrame with product data
         api_tier: "tier1", "tier2", "tier3", or "tier4" for different rate limits
+        progress_callback: Optional async callback(processed, total, percent, message=None)
+        concurrency: Optional cap on in-flight OpenAI requests; lowers, never raises, the tier default
     """
     # Add temporal features first
     df = add_temporal_features(df)
@@ -222,7 +203,9 @@ async def generate_categories(df, api_tier="tier4", progress_callback=None):
         "tier9": {"rpm": 5000, "concurrent": 1000, "batch_size": 2000} # ⚡ WARP SPEED: System limits only!
     }
     
-    config = tier_configs.get(api_tier, tier_configs["tier4"])
+    config = dict(tier_configs.get(api_tier, tier_configs["tier4"]))
+    if concurrency:
+        config["concurrent"] = min(config["concurrent"], concurrency)
     print(f"🚀 Using {api_tier} configuration: {config['rpm']} RPM, {config['concurrent']} concurrent, {config['batch_size']} batch size")
     
     # Generate OpenAI categories with async concurrency and rate limiting
@@ -353,6 +336,11 @@ if __name__ == "__main__":
         print(df['season'].value_counts())
         
         df.to_csv("data\openai_categories.csv", index=False)
+        try:
+            # Columnar copy the dashboard loads instead of re-parsing the CSV on every cold start
+            df.to_parquet(os.path.join("data", "openai_categories.parquet"), index=False, compression="snappy")
+        except (ImportError, ValueError, TypeError) as e:
+            print(f"⚠️ Skipped Parquet copy: {e}")
         
     except Exception as e:
         print(f"Error occurred: {e}")
@@ -107,61 +107,50 @@ class ProductClusterAnalyzer:
     def calculate_clustering_confidence(self, df: pd.DataFrame) -> List[float]:
         """
         Calculate confidence scores based on clustering consistency
-        This is the original confidence scoring method
+        This is the original confidence scoring method, computed from dense
+        cluster x category count tables instead of re-filtering the cluster for every row
         """
         if self.cluster_labels is None:
             raise ValueError("Must perform clustering first")
             
-        df_copy = df.copy()
-        df_copy['cluster_label'] = self.cluster_labels
-        confidence_scores = []
-        
-        for idx, row in df_copy.iterrows():
-            cluster_label = row['cluster_label']
-            
-            # Handle noise points (cluster -1)
-            if cluster_label == -1:
-                confidence_scores.append(0.3)  # Low confidence for noise points
-                continue
-            
-            # Get all products in the same cluster
-            cluster_products = df_copy[df_copy['cluster_label'] == cluster_label]
-            cluster_size = len(cluster_products)
-            
-            if 'openai_category' in row and 'openai_subcategory' in row:
-                product_category = row['openai_category']
-                product_subcategory = row['openai_subcategory']
-                
-                # Calculate category consistency within cluster
-                same_category_count = len(cluster_products[cluster_products['openai_category'] == product_category])
-                same_subcategory_count = len(cluster_products[cluster_products['openai_subcategory'] == product_subcategory])
-                
-                # Calculate consistency ratios
-                category_consistency = same_category_count / cluster_size
-                subcategory_consistency = same_subcategory_count / cluster_size
-                
-                # Calculate base confidence score
-                # Weight: 60% category consistency + 40% subcategory consistency
-                base_confidence = (category_consistency * 0.6) + (subcategory_consistency * 0.4)
-                
-                # Apply cluster size adjustment
-                if cluster_size >= 10:
-                    size_multiplier = 1.1
-                elif cluster_size >= 5:
-                    size_multiplier = 1.0
-                elif cluster_size >= 3:
-                    size_multiplier = 0.9
-                else:
-                    size_multiplier = 0.8
-                
-                # Final confidence score (capped at 1.0)
-                confidence = min(base_confidence * size_multiplier, 1.0)
-                confidence_scores.append(round(confidence, 3))
-            else:
-                # No category data available
-                confidence_scores.append(0.5)
-        
-        return confidence_scores
+        labels = np.asarray(self.cluster_labels)
+        noise = labels == -1
+        
+        if 'openai_category' not in df.columns or 'openai_subcategory' not in df.columns:
+            # No category data available; noise points still get low confidence
+            return np.where(noise, 0.3, 0.5).tolist()
+        
+        cluster_codes, clusters = pd.factorize(labels)
+        cluster_size = np.bincount(cluster_codes, minlength=len(clusters))[cluster_codes]
+        
+        def same_label_count(column):
+            # How many products in each row's cluster share its label (missing labels match nothing)
+            codes, uniques = pd.factorize(df[column])
+            if len(uniques) == 0:
+                # Every label is missing, so no row shares one
+                return np.zeros(len(codes), dtype=np.int64)
+            cells = cluster_codes * len(uniques) + codes
+            counts = np.bincount(cells[codes >= 0], minlength=len(clusters) * len(uniques))
+            return np.where(codes >= 0, counts[np.maximum(cells, 0)], 0)
+        
+        # Calculate consistency ratios
+        category_consistency = same_label_count('openai_category') / cluster_size
+        subcategory_consistency = same_label_count('openai_subcategory') / cluster_size
+        
+        # Calculate base confidence score
+        # Weight: 60% category consistency + 40% subcategory consistency
+        base_confidence = (category_consistency * 0.6) + (subcategory_consistency * 0.4)
+        
+        # Apply cluster size adjustment
+        size_multiplier = np.select(
+            [cluster_size >= 10, cluster_size >= 5, cluster_size >= 3],
+            [1.1, 1.0, 0.9],
+            default=0.8
+        )
+        
+        # Final confidence score (capped at 1.0); noise points get low confidence
+        confidence = np.minimum(base_confidence * size_multiplier, 1.0)
+        return [0.3 if is_noise else round(float(score), 3) for is_noise, score in zip(noise, confidence)]
     
     def visualize_clusters(self, df: pd.DataFrame, title_column: str, save_path=None):
         """Create cluster visualizations"""
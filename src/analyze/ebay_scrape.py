@@ -1,17 +1,43 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from base64 import b64encode
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 
+# One pooled session for the OAuth and Browse calls, so searches reuse warm TLS connections; rate
+# limits and transient gateway errors are retried with backoff instead of failing the search
+_session = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=frozenset({"GET", "POST"}),
+        # Hand the last response back so raise_for_status reports it as before
+        raise_on_status=False
+    )
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# Application tokens are valid for hours; keep the last one so searches don't each pay an OAuth round trip
+_token_cache = {"client_id": None, "token": None, "expires_at": datetime.min}
+
 def get_ebay_access_token() -> str:
-    """Get eBay OAuth access token using client credentials"""
+    """Get eBay OAuth access token using client credentials, reusing the cached one until shortly before it expires"""
     CLIENT_ID = os.getenv('EBAY_CLIENT_ID')
     CLIENT_SECRET = os.getenv('EBAY_CLIENT_SECRET')
     
     if not CLIENT_ID or not CLIENT_SECRET:
         raise ValueError("eBay API credentials not found in environment variables")
     
+    if _token_cache["client_id"] == CLIENT_ID and datetime.now() < _token_cache["expires_at"]:
+        return _token_cache["token"]
+    
     auth = b64encode(f"{CLIENT_ID}:{CLIENT_SECRET}".encode()).decode()
     
     headers = {
@@ -24,10 +50,17 @@ def get_ebay_access_token() -> str:
         "scope": "https://api.ebay.com/oauth/api_scope"
     }
     
-    response = requests.post("https://api.ebay.com/identity/v1/oauth2/token", headers=headers, data=data)
+    response = _session.post("https://api.ebay.com/identity/v1/oauth2/token", headers=headers, data=data)
     response.raise_for_status()
     
-    return response.json()["access_token"]
+    token = response.json()
+    _token_cache.update(
+        client_id=CLIENT_ID,
+        token=token["access_token"],
+        # Refresh a minute early so a token never expires mid-request
+        expires_at=datetime.now() + timedelta(seconds=token.get("expires_in", 7200) - 60)
+    )
+    return token["access_token"]
 
 def search_ebay_items(item_name: str, days_back: int = 7, limit: int = 100) -> Dict:
     """
@@ -59,7 +92,7 @@ def search_ebay_items(item_name: str, days_back: int = 7, limit: int = 100) -> D
         f"&limit={limit}"
     )
     
-    response = requests.get(url, headers=headers)
+    response = _session.get(url, headers=headers)
     response.raise_for_status()
     
     data = response.json()
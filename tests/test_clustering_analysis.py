@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+# The module loads its embedding and clustering stacks at import time
+for module in ("sentence_transformers", "umap", "hdbscan", "matplotlib", "seaborn"):
+    pytest.importorskip(module)
+
+from src.analyze.clustering_analysis import ProductClusterAnalyzer
+
+
+def make_analyzer(labels):
+    # Skip __init__, which downloads the sentence-transformer model
+    analyzer = ProductClusterAnalyzer.__new__(ProductClusterAnalyzer)
+    analyzer.cluster_labels = np.array(labels)
+    return analyzer
+
+
+def test_clustering_confidence_with_all_missing_labels():
+    analyzer = make_analyzer([0, 0, 0, 1, 1, -1])
+    df = pd.DataFrame({
+        'openai_category': [np.nan] * 6,
+        'openai_subcategory': [np.nan] * 6,
+    })
+
+    assert analyzer.calculate_clustering_confidence(df) == [0.0, 0.0, 0.0, 0.0, 0.0, 0.3]
+
+
+def test_clustering_confidence_scores_label_agreement():
+    analyzer = make_analyzer([0, 0, 0, 1, 1, -1])
+    df = pd.DataFrame({
+        'openai_category': ['A', 'A', 'B', 'C', np.nan, 'A'],
+        'openai_subcategory': ['x', 'y', 'y', 'z', 'z', 'x'],
+    })
+
+    # Cluster 0 (size 3, x0.9): rows share category with 2/3, 2/3, 1/3 and subcategory with 1/3, 2/3, 2/3
+    # Cluster 1 (size 2, x0.8): one row with its category alone, both sharing the subcategory
+    assert analyzer.calculate_clustering_confidence(df) == [
+        round((2 / 3 * 0.6 + 1 / 3 * 0.4) * 0.9, 3),
+        round((2 / 3 * 0.6 + 2 / 3 * 0.4) * 0.9, 3),
+        round((1 / 3 * 0.6 + 2 / 3 * 0.4) * 0.9, 3),
+        round((1 / 2 * 0.6 + 1.0 * 0.4) * 0.8, 3),
+        round((0.0 * 0.6 + 1.0 * 0.4) * 0.8, 3),
+        0.3,
+    ]